@@ -0,0 +1,213 @@
+from JackTokenizer import (K_TRUE, K_FALSE, K_NULL, K_THIS, S_PLUS, S_MINUS, S_TIMES,
+                           S_DIVIDE, S_AND, S_OR, S_LT, S_GT, S_EQ)
+from JackAST import (LetStatement, IfStatement, WhileStatement, DoStatement, ReturnStatement,
+                     BinaryOp, UnaryOp, Group, IntegerConstant, StringConstant,
+                     KeywordConstant, VarRef, ArrayRef, SubroutineCall)
+from SymbolTable import SymbolTable
+
+# Operator biner: kode simbol -> perintah VM (* dan / jadi call ke Math)
+ARITHMETIC_OPS = {S_PLUS: 'ADD', S_MINUS: 'SUB', S_AND: 'AND', S_OR: 'OR',
+                  S_LT: 'LT', S_GT: 'GT', S_EQ: 'EQ'}
+CALL_OPS = {S_TIMES: 'Math.multiply', S_DIVIDE: 'Math.divide'}
+
+class CodeGenerator:
+    """Walks a JackAST.Class and writes its VM code into a VMWriter."""
+    def __init__(self, vm_writer):
+        self.vm_writer = vm_writer
+        self.symbol_table = SymbolTable()
+        self.class_name = ""
+        self.label_counter = 0
+
+        # Dispatch per tipe node (lebih cepet dari rantai isinstance)
+        self.statement_writers = {
+            LetStatement: self.write_let,
+            IfStatement: self.write_if,
+            WhileStatement: self.write_while,
+            DoStatement: self.write_do,
+            ReturnStatement: self.write_return,
+        }
+        self.expression_writers = {
+            BinaryOp: self.write_binary,
+            UnaryOp: self.write_unary,
+            Group: self.write_group,
+            IntegerConstant: self.write_integer,
+            StringConstant: self.write_string,
+            KeywordConstant: self.write_keyword,
+            VarRef: self.write_var,
+            ArrayRef: self.write_array,
+            SubroutineCall: self.write_call,
+        }
+
+    # --- STRUCTURE ---
+
+    def write_class(self, node):
+        self.class_name = node.name
+        for dec in node.var_decs:
+            for name in dec.names:
+                self.symbol_table.define(name, dec.type, dec.kind)
+        for subroutine in node.subroutines:
+            self.write_subroutine(subroutine)
+
+    def write_subroutine(self, node):
+        self.symbol_table.start_subroutine()
+        if node.kind == 'method':
+            self.symbol_table.define('this', self.class_name, 'arg')
+        for type, name in node.parameters:
+            self.symbol_table.define(name, type, 'arg')
+        for dec in node.var_decs:
+            for name in dec.names:
+                self.symbol_table.define(name, dec.type, 'var')
+
+        n_vars = self.symbol_table.var_count('var')
+        self.vm_writer.write_function(f"{self.class_name}.{node.name}", n_vars)
+
+        if node.kind == 'constructor':
+            n_fields = self.symbol_table.var_count('field')
+            self.vm_writer.write_push('constant', n_fields)
+            self.vm_writer.write_call('Memory.alloc', 1)
+            self.vm_writer.write_pop('pointer', 0)
+        elif node.kind == 'method':
+            self.vm_writer.write_push('argument', 0)
+            self.vm_writer.write_pop('pointer', 0)
+
+        self.write_statements(node.statements)
+
+    # --- STATEMENTS ---
+
+    def write_statements(self, statements):
+        for statement in statements:
+            self.statement_writers[type(statement)](statement)
+
+    def write_do(self, node):
+        self.write_call(node.call)
+        self.vm_writer.write_pop('temp', 0)
+
+    def write_let(self, node):
+        if node.index is not None:
+            self.push_var(node.name)
+            self.write_expression(node.index)
+            self.vm_writer.write_arithmetic('ADD')
+            self.write_expression(node.value)
+            self.vm_writer.write_pop('temp', 0)
+            self.vm_writer.write_pop('pointer', 1)
+            self.vm_writer.write_push('temp', 0)
+            self.vm_writer.write_pop('that', 0)
+        else:
+            self.write_expression(node.value)
+            kind = self.symbol_table.kind_of(node.name)
+            idx = self.symbol_table.index_of(node.name)
+            self.vm_writer.write_pop(self._kind_to_segment(kind), idx)
+
+    def write_while(self, node):
+        l1 = f"WHILE_EXP{self.label_counter}"; l2 = f"WHILE_END{self.label_counter}"
+        self.label_counter += 1
+        self.vm_writer.write_label(l1)
+        self.write_expression(node.condition)
+        self.vm_writer.write_arithmetic('NOT')
+        self.vm_writer.write_if(l2)
+        self.write_statements(node.statements)
+        self.vm_writer.write_goto(l1)
+        self.vm_writer.write_label(l2)
+
+    def write_return(self, node):
+        if node.value is not None:
+            self.write_expression(node.value)
+        else:
+            self.vm_writer.write_push('constant', 0)
+        self.vm_writer.write_return()
+
+    def write_if(self, node):
+        l2 = f"IF_FALSE{self.label_counter}"; l3 = f"IF_END{self.label_counter}"
+        self.label_counter += 1
+        self.write_expression(node.condition)
+        self.vm_writer.write_arithmetic('NOT')
+        self.vm_writer.write_if(l2)
+        self.write_statements(node.statements)
+        self.vm_writer.write_goto(l3)
+        self.vm_writer.write_label(l2)
+        if node.else_statements is not None:
+            self.write_statements(node.else_statements)
+        self.vm_writer.write_label(l3)
+
+    # --- EXPRESSIONS ---
+
+    def write_expression(self, node):
+        # None: term kosong (input rusak), sama kayak dulu gak nulis apa-apa
+        if node is not None:
+            self.expression_writers[type(node)](node)
+
+    def write_binary(self, node):
+        # Jalan di sepanjang rantai kiri tanpa rekursi, biar expression
+        # panjang (a + b + c + ...) gak mentok recursion limit
+        tail = []
+        while type(node) is BinaryOp:
+            tail.append(node)
+            node = node.left
+        self.write_expression(node)
+        for node in reversed(tail):
+            self.write_expression(node.right)
+            if node.op in CALL_OPS: self.vm_writer.write_call(CALL_OPS[node.op], 2)
+            else: self.vm_writer.write_arithmetic(ARITHMETIC_OPS[node.op])
+
+    def write_unary(self, node):
+        self.write_expression(node.operand)
+        if node.op == S_MINUS: self.vm_writer.write_arithmetic('NEG')
+        else: self.vm_writer.write_arithmetic('NOT')
+
+    def write_group(self, node):
+        self.write_expression(node.expression)
+
+    def write_integer(self, node):
+        self.vm_writer.write_push('constant', node.value)
+
+    def write_string(self, node):
+        s = node.value
+        self.vm_writer.write_push('constant', len(s))
+        self.vm_writer.write_call('String.new', 1)
+        for c in s:
+            self.vm_writer.write_push('constant', ord(c))
+            self.vm_writer.write_call('String.appendChar', 2)
+
+    def write_keyword(self, node):
+        k = node.keyword
+        if k == K_TRUE:
+            self.vm_writer.write_push('constant', 0)
+            self.vm_writer.write_arithmetic('NOT')
+        elif k == K_FALSE or k == K_NULL: self.vm_writer.write_push('constant', 0)
+        elif k == K_THIS: self.vm_writer.write_push('pointer', 0)
+
+    def write_var(self, node):
+        self.push_var(node.name)
+
+    def write_array(self, node):
+        self.push_var(node.name)
+        self.write_expression(node.index)
+        self.vm_writer.write_arithmetic('ADD')
+        self.vm_writer.write_pop('pointer', 1)
+        self.vm_writer.write_push('that', 0)
+
+    def write_call(self, node):
+        n_args = 0
+        if node.receiver is not None:
+            type = self.symbol_table.type_of(node.receiver)
+            if type is None:
+                full_name = f"{node.receiver}.{node.name}"
+            else:
+                self.push_var(node.receiver)
+                full_name = f"{type}.{node.name}"
+                n_args = 1
+        else:
+            self.vm_writer.write_push('pointer', 0)
+            full_name = f"{self.class_name}.{node.name}"
+            n_args = 1
+        for argument in node.arguments:
+            self.write_expression(argument)
+        self.vm_writer.write_call(full_name, n_args + len(node.arguments))
+
+    def push_var(self, name):
+        kind = self.symbol_table.kind_of(name)
+        idx = self.symbol_table.index_of(name)
+        self.vm_writer.write_push(self._kind_to_segment(kind), idx)
+
+    def _kind_to_segment(self, kind):
+        return {'var':'local', 'arg':'argument', 'field':'this', 'static':'static'}.get(kind, 'error')
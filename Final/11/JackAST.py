@@ -0,0 +1,148 @@
+# Node AST buat Jack. Semua pake __slots__ biar kecil (satu class gede
+# bisa punya ratusan ribu node). Kode simbol/keyword (S_*, K_*) dari
+# JackTokenizer dipake langsung buat operator & keyword constant.
+
+class Node:
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+# --- 1. PROGRAM STRUCTURE ---
+
+class Class(Node):
+    __slots__ = ('name', 'var_decs', 'subroutines')
+
+    def __init__(self, name, var_decs, subroutines):
+        self.name = name
+        self.var_decs = var_decs          # [ClassVarDec]
+        self.subroutines = subroutines    # [Subroutine]
+
+class ClassVarDec(Node):
+    __slots__ = ('kind', 'type', 'names')
+
+    def __init__(self, kind, type, names):
+        self.kind = kind                  # 'static' / 'field'
+        self.type = type
+        self.names = names
+
+class Subroutine(Node):
+    __slots__ = ('kind', 'return_type', 'name', 'parameters', 'var_decs', 'statements')
+
+    def __init__(self, kind, return_type, name, parameters, var_decs, statements):
+        self.kind = kind                  # 'constructor' / 'function' / 'method'
+        self.return_type = return_type
+        self.name = name
+        self.parameters = parameters      # [(type, name)]
+        self.var_decs = var_decs          # [VarDec]
+        self.statements = statements
+
+class VarDec(Node):
+    __slots__ = ('type', 'names')
+
+    def __init__(self, type, names):
+        self.type = type
+        self.names = names
+
+# --- 2. STATEMENTS ---
+
+class LetStatement(Node):
+    __slots__ = ('name', 'index', 'value')
+
+    def __init__(self, name, index, value):
+        self.name = name
+        self.index = index                # expression, None kalo bukan array
+        self.value = value
+
+class IfStatement(Node):
+    __slots__ = ('condition', 'statements', 'else_statements')
+
+    def __init__(self, condition, statements, else_statements):
+        self.condition = condition
+        self.statements = statements
+        self.else_statements = else_statements  # None kalo gak ada else
+
+class WhileStatement(Node):
+    __slots__ = ('condition', 'statements')
+
+    def __init__(self, condition, statements):
+        self.condition = condition
+        self.statements = statements
+
+class DoStatement(Node):
+    __slots__ = ('call',)
+
+    def __init__(self, call):
+        self.call = call                  # SubroutineCall
+
+class ReturnStatement(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value                # None buat 'return;'
+
+# --- 3. EXPRESSIONS ---
+# Jack gak punya precedence: a + b * c = (a + b) * c, jadi expression
+# jadi rantai BinaryOp yang nyambung ke kiri. Operand kanan selalu term.
+
+class BinaryOp(Node):
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op = op                      # S_PLUS, S_MINUS, ...
+        self.left = left
+        self.right = right
+
+class UnaryOp(Node):
+    __slots__ = ('op', 'operand')
+
+    def __init__(self, op, operand):
+        self.op = op                      # S_MINUS / S_NOT
+        self.operand = operand
+
+class Group(Node):
+    # '(' expression ')' -- gak ngaruh ke kode VM, disimpen biar XML sama
+    __slots__ = ('expression',)
+
+    def __init__(self, expression):
+        self.expression = expression
+
+class IntegerConstant(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class StringConstant(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class KeywordConstant(Node):
+    __slots__ = ('keyword',)
+
+    def __init__(self, keyword):
+        self.keyword = keyword            # K_TRUE / K_FALSE / K_NULL / K_THIS
+
+class VarRef(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+class ArrayRef(Node):
+    __slots__ = ('name', 'index')
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+class SubroutineCall(Node):
+    __slots__ = ('receiver', 'name', 'arguments')
+
+    def __init__(self, receiver, name, arguments):
+        self.receiver = receiver          # nama class/variable sebelum '.', None buat method sendiri
+        self.name = name
+        self.arguments = arguments
@@ -1,11 +1,17 @@
 import sys
 import os
-from JackTokenizer import JackTokenizer
+import argparse
+from JackTokenizer import JackTokenizer, JackTokenizerError, TokenCache
 from CompilationEngine import CompilationEngine
+from XMLGenerator import XMLGenerator
 
 class JackAnalyzer:
-    def __init__(self, input_path):
+    def __init__(self, input_path, cache=None, xml=False):
         self.input_path = input_path
+        # cache: TokenCache (opsional), token stream per file dipake ulang
+        self.cache = cache
+        # xml: tulis juga parse tree project 10 (.xml) dari AST yang sama
+        self.xml = xml
 
     def analyze(self):
         files = []
@@ -17,8 +23,16 @@ class JackAnalyzer:
         for file in files:
             self.process_file(file)
 
+        if self.cache is not None:
+            self.cache.evict()
+            print(f"Token cache: {self.cache.hits} hits, {self.cache.misses} misses, "
+                  f"{self.cache.evicted} evicted ({self.cache.directory})")
+
     def process_file(self, input_file):
-        tokenizer = JackTokenizer(input_file)
+        if self.cache is not None:
+            tokenizer = JackTokenizer(input_file, self.cache.load(input_file))
+        else:
+            tokenizer = JackTokenizer(input_file)
         # Output file sekarang .xml (bukan T.xml lagi)
         output_file = input_file.replace('.jack', '.vm') 
         
@@ -27,9 +41,26 @@ class JackAnalyzer:
         # Panggil CompilationEngine
         engine = CompilationEngine(tokenizer, output_file)
 
+        if self.xml and engine.tree is not None:
+            xml_writer = XMLGenerator(input_file.replace('.jack', '.xml'))
+            xml_writer.write_class(engine.tree)
+            xml_writer.close()
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python JackAnalyzer.py <file.jack or dir>")
-    else:
-        analyzer = JackAnalyzer(sys.argv[1])
-        analyzer.analyze()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Jack compiler (.jack -> .vm)")
+    parser.add_argument("input", help=".jack file or directory")
+    parser.add_argument("--cache-dir", help="reuse token streams of unchanged files from this cache directory")
+    parser.add_argument("--cache-size", type=float, default=16,
+                        help="cache size limit in MB, least recently used entries are evicted (default: 16)")
+    parser.add_argument("--xml", action="store_true",
+                        help="also write the project-10 parse tree (.xml) from the same parse")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache_dir:
+        cache = TokenCache(args.cache_dir, int(args.cache_size * 1024 * 1024))
+    try:
+        JackAnalyzer(args.input, cache, args.xml).analyze()
+    except JackTokenizerError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,218 @@
+from JackTokenizer import (KEYWORD, SYMBOL, INT_CONST, STRING_CONST, IDENTIFIER,
+                           K_CONSTRUCTOR, K_FUNCTION, K_METHOD, K_FIELD, K_STATIC, K_VAR,
+                           K_LET, K_DO, K_IF, K_ELSE, K_WHILE, K_RETURN,
+                           S_LPAREN, S_RPAREN, S_LBRACKET, S_DOT, S_COMMA, S_SEMICOLON,
+                           S_PLUS, S_MINUS, S_TIMES, S_DIVIDE, S_AND, S_OR, S_LT, S_GT,
+                           S_EQ, S_NOT)
+from JackAST import (Class, ClassVarDec, Subroutine, VarDec, LetStatement, IfStatement,
+                     WhileStatement, DoStatement, ReturnStatement, BinaryOp, UnaryOp, Group,
+                     IntegerConstant, StringConstant, KeywordConstant, VarRef, ArrayRef,
+                     SubroutineCall)
+
+BINARY_OPS = {S_PLUS, S_MINUS, S_TIMES, S_DIVIDE, S_AND, S_OR, S_LT, S_GT, S_EQ}
+
+class Parser:
+    """Recursive descent parser: tokens of one class -> JackAST.Class."""
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def parse(self):
+        # None kalo file-nya kosong
+        if not self.tokenizer.has_more_tokens():
+            return None
+        self.tokenizer.advance()
+        return self.parse_class()
+
+    def eat(self):
+        self.tokenizer.advance()
+
+    def take(self):
+        # Ambil teks token sekarang, lalu maju
+        value = self.tokenizer.value()
+        self.tokenizer.advance()
+        return value
+
+    def at_keyword(self, *codes):
+        return self.tokenizer.kind == KEYWORD and self.tokenizer.code in codes
+
+    def at_symbol(self, code):
+        return self.tokenizer.kind == SYMBOL and self.tokenizer.code == code
+
+    # --- STRUCTURE ---
+
+    def parse_class(self):
+        self.eat() # class
+        name = self.take()
+        self.eat() # {
+        var_decs = []
+        while self.at_keyword(K_STATIC, K_FIELD):
+            var_decs.append(self.parse_class_var_dec())
+        subroutines = []
+        while self.at_keyword(K_CONSTRUCTOR, K_FUNCTION, K_METHOD):
+            subroutines.append(self.parse_subroutine())
+        self.eat() # }
+        return Class(name, var_decs, subroutines)
+
+    def parse_class_var_dec(self):
+        kind = self.take()
+        type = self.take()
+        names = self.parse_names()
+        return ClassVarDec(kind, type, names)
+
+    def parse_names(self):
+        # varName (',' varName)* ';'
+        names = [self.take()]
+        while self.at_symbol(S_COMMA):
+            self.eat()
+            names.append(self.take())
+        self.eat() # ;
+        return names
+
+    def parse_subroutine(self):
+        kind = self.take()
+        return_type = self.take()
+        name = self.take()
+        self.eat() # (
+        parameters = self.parse_parameter_list()
+        self.eat() # )
+        self.eat() # {
+        var_decs = []
+        while self.at_keyword(K_VAR):
+            self.eat() # var
+            type = self.take()
+            var_decs.append(VarDec(type, self.parse_names()))
+        statements = self.parse_statements()
+        self.eat() # }
+        return Subroutine(kind, return_type, name, parameters, var_decs, statements)
+
+    def parse_parameter_list(self):
+        parameters = []
+        if not self.at_symbol(S_RPAREN):
+            parameters.append((self.take(), self.take()))
+            while self.at_symbol(S_COMMA):
+                self.eat()
+                parameters.append((self.take(), self.take()))
+        return parameters
+
+    # --- STATEMENTS ---
+
+    def parse_statements(self):
+        statements = []
+        while self.tokenizer.kind == KEYWORD:
+            kw = self.tokenizer.code
+            if kw == K_LET: statements.append(self.parse_let())
+            elif kw == K_IF: statements.append(self.parse_if())
+            elif kw == K_WHILE: statements.append(self.parse_while())
+            elif kw == K_DO: statements.append(self.parse_do())
+            elif kw == K_RETURN: statements.append(self.parse_return())
+            else: break
+        return statements
+
+    def parse_let(self):
+        self.eat() # let
+        name = self.take()
+        index = None
+        if self.at_symbol(S_LBRACKET):
+            self.eat()
+            index = self.parse_expression()
+            self.eat() # ]
+        self.eat() # =
+        value = self.parse_expression()
+        self.eat() # ;
+        return LetStatement(name, index, value)
+
+    def parse_if(self):
+        self.eat(); self.eat() # if (
+        condition = self.parse_expression()
+        self.eat(); self.eat() # ) {
+        statements = self.parse_statements()
+        self.eat() # }
+        else_statements = None
+        if self.at_keyword(K_ELSE):
+            self.eat(); self.eat() # else {
+            else_statements = self.parse_statements()
+            self.eat() # }
+        return IfStatement(condition, statements, else_statements)
+
+    def parse_while(self):
+        self.eat(); self.eat() # while (
+        condition = self.parse_expression()
+        self.eat(); self.eat() # ) {
+        statements = self.parse_statements()
+        self.eat() # }
+        return WhileStatement(condition, statements)
+
+    def parse_do(self):
+        self.eat() # do
+        call = self.parse_subroutine_call(self.take())
+        self.eat() # ;
+        return DoStatement(call)
+
+    def parse_return(self):
+        self.eat() # return
+        value = None
+        if not self.at_symbol(S_SEMICOLON):
+            value = self.parse_expression()
+        self.eat() # ;
+        return ReturnStatement(value)
+
+    # --- EXPRESSIONS ---
+
+    def parse_expression(self):
+        expression = self.parse_term()
+        while self.tokenizer.kind == SYMBOL and self.tokenizer.code in BINARY_OPS:
+            op = self.tokenizer.code
+            self.eat()
+            expression = BinaryOp(op, expression, self.parse_term())
+        return expression
+
+    def parse_term(self):
+        tt = self.tokenizer.kind
+        if tt == INT_CONST:
+            return IntegerConstant(self.take())
+        if tt == STRING_CONST:
+            return StringConstant(self.take())
+        if tt == KEYWORD:
+            term = KeywordConstant(self.tokenizer.code)
+            self.eat()
+            return term
+        if tt == IDENTIFIER:
+            name = self.take()
+            if self.at_symbol(S_LBRACKET):
+                self.eat()
+                index = self.parse_expression()
+                self.eat() # ]
+                return ArrayRef(name, index)
+            if self.at_symbol(S_LPAREN) or self.at_symbol(S_DOT):
+                return self.parse_subroutine_call(name)
+            return VarRef(name)
+        if self.at_symbol(S_LPAREN):
+            self.eat()
+            expression = self.parse_expression()
+            self.eat() # )
+            return Group(expression)
+        if self.at_symbol(S_MINUS) or self.at_symbol(S_NOT):
+            op = self.tokenizer.code
+            self.eat()
+            return UnaryOp(op, self.parse_term())
+        return None
+
+    def parse_expression_list(self):
+        arguments = []
+        if not self.at_symbol(S_RPAREN):
+            arguments.append(self.parse_expression())
+            while self.at_symbol(S_COMMA):
+                self.eat()
+                arguments.append(self.parse_expression())
+        return arguments
+
+    def parse_subroutine_call(self, name):
+        # name '(' ... ')'  atau  receiver '.' name '(' ... ')'
+        receiver = None
+        if self.at_symbol(S_DOT):
+            self.eat()
+            receiver, name = name, self.take()
+        self.eat() # (
+        arguments = self.parse_expression_list()
+        self.eat() # )
+        return SubroutineCall(receiver, name, arguments)
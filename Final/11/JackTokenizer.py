@@ -1,90 +1,277 @@
+import os
 import re
+import sys
+import json
+import mmap
+import hashlib
+from array import array
+
+# Cache LRU di disk dipake bareng sama VM translator (Final/8)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from disk_cache import DiskCache
+
+# --- 1. TOKEN CODES ---
+# Tipe token disimpen sebagai int kecil, bukan string 'KEYWORD' dst.
+# Keyword & simbol juga punya kode int sendiri, jadi parser cukup
+# bandingin int (tok.kind == SYMBOL and tok.code == S_COMMA).
+
+KEYWORD, SYMBOL, INT_CONST, STRING_CONST, IDENTIFIER = range(5)
+TOKEN_TYPES = ('KEYWORD', 'SYMBOL', 'INT_CONST', 'STRING_CONST', 'IDENTIFIER')
+XML_TAGS = ('keyword', 'symbol', 'integerConstant', 'stringConstant', 'identifier')
+
+KEYWORDS = ('class', 'constructor', 'function', 'method', 'field', 'static', 'var',
+            'int', 'char', 'boolean', 'void', 'true', 'false', 'null', 'this',
+            'let', 'do', 'if', 'else', 'while', 'return')
+(K_CLASS, K_CONSTRUCTOR, K_FUNCTION, K_METHOD, K_FIELD, K_STATIC, K_VAR,
+ K_INT, K_CHAR, K_BOOLEAN, K_VOID, K_TRUE, K_FALSE, K_NULL, K_THIS,
+ K_LET, K_DO, K_IF, K_ELSE, K_WHILE, K_RETURN) = range(len(KEYWORDS))
+KEYWORD_CODES = {word.encode(): code for code, word in enumerate(KEYWORDS)}
+
+SYMBOLS = '{}()[].,;+-*/&|<>=~'
+(S_LBRACE, S_RBRACE, S_LPAREN, S_RPAREN, S_LBRACKET, S_RBRACKET, S_DOT,
+ S_COMMA, S_SEMICOLON, S_PLUS, S_MINUS, S_TIMES, S_DIVIDE, S_AND, S_OR,
+ S_LT, S_GT, S_EQ, S_NOT) = range(len(SYMBOLS))
+SYMBOL_CODES = {ord(s): code for code, s in enumerate(SYMBOLS)}
+
+MAX_INT = 32767
+
+# Karakter XML yang harus di-escape (simbol < > & dan isi string constant)
+XML_ESCAPES = str.maketrans({'<': '&lt;', '>': '&gt;', '&': '&amp;', '"': '&quot;'})
+
+# --- 2. SCANNER ---
+# Comment & whitespace ikut di master regex (harus sebelum SYMBOL,
+# biar '/' pembuka comment gak kebaca jadi simbol bagi). Keyword gak
+# punya pattern sendiri: WORD dicek ke KEYWORD_CODES, jadi 'doX' tetap
+# satu identifier. Pattern-nya bytes karena di-scan langsung di atas mmap.
+
+TOKEN_REGEX = re.compile(rb'''
+    (?P<COMMENT>/\*.*?\*/|//[^\n]*)
+  | (?P<SPACE>\s+)
+  | (?P<SYMBOL>[{}()\[\].,;+\-*/&|<>=~])
+  | (?P<INT_CONST>\d+)
+  | (?P<STRING_CONST>"[^\n"]*")
+  | (?P<WORD>[a-zA-Z_]\w*)
+  | (?P<ERROR>.)
+''', re.DOTALL | re.VERBOSE)
+
+class JackTokenizerError(Exception):
+    pass
+
+def scan(input_file, intern):
+    """
+    Single pass over the memory-mapped source. Yields (kind, code, line, column)
+    one token at a time. `intern(text)` gives the code of an identifier or
+    string constant; keywords and symbols use their fixed codes and integer
+    constants their own value.
+    """
+    with open(input_file, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap gak bisa buat file kosong
+            return
+        with buffer:
+            yield from scan_buffer(buffer, input_file, intern)
+
+def scan_buffer(buffer, input_file, intern):
+    """Same as scan(), over a bytes-like buffer already in memory."""
+    line, line_start = 1, 0
+    for match in TOKEN_REGEX.finditer(buffer):
+        group = match.lastgroup
+        start, end = match.span()
+
+        if group == 'SPACE' or group == 'COMMENT':
+            # Update posisi baris kalo ada newline yang dilewatin
+            if buffer.find(b'\n', start, end) != -1:
+                line += match.group().count(b'\n')
+                line_start = buffer.rfind(b'\n', start, end) + 1
+            continue
+
+        column = start - line_start + 1
+        if group == 'SYMBOL':
+            yield SYMBOL, SYMBOL_CODES[buffer[start]], line, column
+        elif group == 'WORD':
+            word = match.group()
+            code = KEYWORD_CODES.get(word)
+            if code is None:
+                yield IDENTIFIER, intern(word.decode()), line, column
+            else:
+                yield KEYWORD, code, line, column
+        elif group == 'INT_CONST':
+            value = int(match.group())
+            if value > MAX_INT:
+                raise JackTokenizerError(
+                    f"{input_file}:{line}:{column}: integer constant {value} out of range")
+            yield INT_CONST, value, line, column
+        elif group == 'STRING_CONST':
+            # Buang kutip " di awal dan akhir
+            yield STRING_CONST, intern(buffer[start + 1:end - 1].decode()), line, column
+        else:
+            raise JackTokenizerError(
+                f"{input_file}:{line}:{column}: unexpected character {match.group().decode(errors='replace')!r}")
+
+# --- 3. COMPACT TOKEN STORE ---
+
+class TokenStream:
+    """
+    Whole-file token store: kind/code/line/column in parallel arrays and
+    identifier/string text interned once in `names`.
+    """
+    __slots__ = ('kinds', 'codes', 'lines', 'columns', 'names', '_name_codes')
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.codes = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.names = []
+        self._name_codes = {}
+
+    @classmethod
+    def from_file(cls, input_file, source=None):
+        # source: isi file (bytes) kalo udah kebaca, biar gak baca dua kali
+        stream = cls()
+        if source is None:
+            tokens = scan(input_file, stream.intern)
+        else:
+            tokens = scan_buffer(source, input_file, stream.intern)
+        for token in tokens:
+            stream.append(*token)
+        return stream
+
+    def intern(self, text):
+        code = self._name_codes.get(text)
+        if code is None:
+            code = self._name_codes[text] = len(self.names)
+            self.names.append(text)
+        return code
+
+    def append(self, kind, code, line, column):
+        self.kinds.append(kind)
+        self.codes.append(code)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.kinds, self.codes, self.lines, self.columns)
+
+    def to_bytes(self):
+        # Header JSON (jumlah token + tabel nama) satu baris, lalu isi array mentah
+        header = json.dumps({"tokens": len(self), "names": self.names}).encode()
+        return b''.join([header, b'\n', self.kinds.tobytes(), self.codes.tobytes(),
+                         self.lines.tobytes(), self.columns.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data):
+        newline = data.index(b'\n')
+        header = json.loads(data[:newline])
+        stream = cls()
+        stream.names = header["names"]
+        stream._name_codes = {name: code for code, name in enumerate(stream.names)}
+        offset = newline + 1
+        for column in (stream.kinds, stream.codes, stream.lines, stream.columns):
+            end = offset + header["tokens"] * column.itemsize
+            column.frombytes(data[offset:end])
+            offset = end
+        if offset != len(data):
+            raise ValueError("truncated token stream")
+        return stream
+
+# --- 4. TOKEN CACHE ---
+# Token stream hasil lexing disimpen di disk, key-nya hash isi source.
+# File .jack yang gak berubah (OS Final/12, app Final/9) gak di-lex ulang.
+
+TOKENIZER_VERSION = "1"
+
+class TokenCache(DiskCache):
+    suffix = ".tok"
+
+    def key(self, source):
+        h = hashlib.sha256()
+        h.update(TOKENIZER_VERSION.encode() + b'\0')
+        h.update(source)
+        return h.hexdigest()
+
+    def encode(self, stream):
+        return stream.to_bytes()
+
+    def decode(self, data):
+        return TokenStream.from_bytes(data)
+
+    def load(self, input_file):
+        """Returns the TokenStream of input_file, lexing it only on a cache miss."""
+        with open(input_file, 'rb') as f:
+            source = f.read()
+        key = self.key(source)
+        stream = self.get(key)
+        if stream is None:
+            stream = TokenStream.from_file(input_file, source)
+            self.put(key, stream)
+        return stream
+
+# --- 5. CURSOR ---
 
 class JackTokenizer:
-    # Regex Patterns for Jack Language
-    # Tambahkan \b di awal dan akhir grup keyword
-    # Gunakan raw string r'' biar backslash aman
-    KEYWORD = r'(?P<KEYWORD>\b(?:class|constructor|function|method|field|static|var|int|char|boolean|void|true|false|null|this|let|do|if|else|while|return)\b)'
-    SYMBOL = '(?P<SYMBOL>[\\{\\}\\(\\)\\[\\]\\.\\,\\;\\+\\-\\*\\/\\&\\|\\<\\>\\=\\~])'
-    INT_CONST = '(?P<INT_CONST>\\d+)'
-    STRING_CONST = '(?P<STRING_CONST>\\"[^\\n\\"]*\\")'
-    IDENTIFIER = '(?P<IDENTIFIER>[a-zA-Z_]\\w*)'
-    
-    # Master Regex: Gabungin semua pattern jadi satu
-    TOKEN_REGEX = f'{KEYWORD}|{SYMBOL}|{INT_CONST}|{STRING_CONST}|{IDENTIFIER}'
-
-    def __init__(self, input_file):
-        with open(input_file, 'r') as f:
-            self.content = f.read()
-        
-        self.tokens = self._tokenize(self.content)
-        self.cursor = 0
-        self.current_token = None
-
-    def _tokenize(self, text):
-        # 1. Hapus Comments
-        # Hapus /* ... */ (multiline)
-        text = re.sub(r'/\*.*?\*/', ' ', text, flags=re.DOTALL)
-        # Hapus // ... (single line)
-        text = re.sub(r'//.*', ' ', text)
-        
-        # 2. Find all tokens
-        tokens = []
-        for match in re.finditer(self.TOKEN_REGEX, text):
-            # match.lastgroup ngasih tau tipe token (KEYWORD, SYMBOL, dll)
-            # match.group() ngasih tau isi textnya
-            token_type = match.lastgroup
-            token_value = match.group()
-            
-            if token_type == 'STRING_CONST':
-                token_value = token_value[1:-1] # Buang kutip " di awal dan akhir
-                
-            tokens.append((token_type, token_value))
-            
-        return tokens
+    """
+    Cursor over the tokens of one .jack file. Tokens are scanned lazily
+    (only the current one and one lookahead are kept), or read from a
+    TokenStream when one is given.
+    """
+    __slots__ = ('input_file', 'names', '_tokens', '_next',
+                 'kind', 'code', 'line', 'column')
+
+    def __init__(self, input_file, stream=None):
+        self.input_file = input_file
+        if stream is None:
+            # Lazy: cuma tabel nama yang tumbuh (sebanyak nama unik)
+            stream = TokenStream()
+            self._tokens = scan(input_file, stream.intern)
+        else:
+            self._tokens = iter(stream)
+        self.names = stream.names
+        self._next = next(self._tokens, None)
+        self.kind = self.code = None
+        self.line = self.column = 0
 
     def has_more_tokens(self):
-        return self.cursor < len(self.tokens)
+        return self._next is not None
 
     def advance(self):
         if self.has_more_tokens():
-            self.current_token = self.tokens[self.cursor]
-            self.cursor += 1
+            self.kind, self.code, self.line, self.column = self._next
+            self._next = next(self._tokens, None)
+
+    def value(self):
+        """Text of the current token (int for integer constants)."""
+        kind = self.kind
+        if kind == KEYWORD: return KEYWORDS[self.code]
+        if kind == SYMBOL: return SYMBOLS[self.code]
+        if kind == INT_CONST: return self.code
+        return self.names[self.code]
 
     def token_type(self):
-        return self.current_token[0]
+        return TOKEN_TYPES[self.kind]
 
     def keyword(self):
-        return self.current_token[1]
+        return self.value()
 
     def symbol(self):
-        return self.current_token[1]
+        return self.value()
 
     def identifier(self):
-        return self.current_token[1]
+        return self.value()
 
     def int_val(self):
-        return self.current_token[1]
+        return self.value()
 
     def string_val(self):
-        return self.current_token[1]
-    
+        return self.value()
+
     def token_type_xml_tag(self):
-        # Mapping tipe regex ke tag XML
-        tag_map = {
-            'KEYWORD': 'keyword',
-            'SYMBOL': 'symbol',
-            'IDENTIFIER': 'identifier',
-            'INT_CONST': 'integerConstant',
-            'STRING_CONST': 'stringConstant'
-        }
-        return tag_map[self.token_type()]
+        return XML_TAGS[self.kind]
 
     def current_token_value_xml(self):
-        t_type = self.token_type()
-        if t_type == 'KEYWORD': return self.keyword()
-        if t_type == 'SYMBOL': return self.symbol()
-        if t_type == 'IDENTIFIER': return self.identifier()
-        if t_type == 'INT_CONST': return self.int_val()
-        if t_type == 'STRING_CONST': return self.string_val()
-        return ""
\ No newline at end of file
+        return str(self.value()).translate(XML_ESCAPES)
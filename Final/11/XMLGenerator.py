@@ -0,0 +1,239 @@
+from JackTokenizer import KEYWORDS, SYMBOLS, XML_ESCAPES
+from JackAST import (LetStatement, IfStatement, WhileStatement, DoStatement, ReturnStatement,
+                     BinaryOp, UnaryOp, Group, IntegerConstant, StringConstant,
+                     KeywordConstant, VarRef, ArrayRef, SubroutineCall)
+
+# Tipe bawaan ditulis sebagai <keyword>, nama class sebagai <identifier>
+BUILTIN_TYPES = {'int', 'char', 'boolean', 'void'}
+
+class XMLGenerator:
+    """
+    Walks a JackAST.Class and writes the project-10 parse tree XML
+    (same layout as Final/10/CompilationEngine).
+    """
+    def __init__(self, output_file):
+        self.output = open(output_file, 'w')
+        self.indent_level = 0
+
+        self.statement_writers = {
+            LetStatement: self.write_let,
+            IfStatement: self.write_if,
+            WhileStatement: self.write_while,
+            DoStatement: self.write_do,
+            ReturnStatement: self.write_return,
+        }
+        self.term_writers = {
+            UnaryOp: self.write_unary,
+            Group: self.write_group,
+            IntegerConstant: self.write_integer,
+            StringConstant: self.write_string,
+            KeywordConstant: self.write_keyword_constant,
+            VarRef: self.write_var,
+            ArrayRef: self.write_array,
+            SubroutineCall: self.write_call,
+        }
+
+    def close(self):
+        self.output.close()
+
+    # --- HELPER: XML Writing ---
+
+    def write_line(self, line):
+        self.output.write(('  ' * self.indent_level) + line + '\n')
+
+    def write_token(self, tag, value):
+        self.write_line(f"<{tag}> {str(value).translate(XML_ESCAPES)} </{tag}>")
+
+    def keyword(self, value):
+        self.write_token('keyword', value)
+
+    def symbol(self, value):
+        self.write_token('symbol', value)
+
+    def identifier(self, value):
+        self.write_token('identifier', value)
+
+    def type_name(self, value):
+        self.write_token('keyword' if value in BUILTIN_TYPES else 'identifier', value)
+
+    def open_tag(self, tag):
+        self.write_line(f"<{tag}>")
+        self.indent_level += 1
+
+    def close_tag(self, tag):
+        self.indent_level -= 1
+        self.write_line(f"</{tag}>")
+
+    # --- GRAMMAR: Program Structure ---
+
+    def write_class(self, node):
+        self.open_tag('class')
+        self.keyword('class')
+        self.identifier(node.name)
+        self.symbol('{')
+        for dec in node.var_decs:
+            self.open_tag('classVarDec')
+            self.keyword(dec.kind)
+            self.write_names(dec.type, dec.names)
+            self.close_tag('classVarDec')
+        for subroutine in node.subroutines:
+            self.write_subroutine(subroutine)
+        self.symbol('}')
+        self.close_tag('class')
+
+    def write_names(self, type, names):
+        # type varName (',' varName)* ';'
+        self.type_name(type)
+        for i, name in enumerate(names):
+            if i: self.symbol(',')
+            self.identifier(name)
+        self.symbol(';')
+
+    def write_subroutine(self, node):
+        self.open_tag('subroutineDec')
+        self.keyword(node.kind)
+        self.type_name(node.return_type)
+        self.identifier(node.name)
+        self.symbol('(')
+        self.open_tag('parameterList')
+        for i, (type, name) in enumerate(node.parameters):
+            if i: self.symbol(',')
+            self.type_name(type)
+            self.identifier(name)
+        self.close_tag('parameterList')
+        self.symbol(')')
+
+        self.open_tag('subroutineBody')
+        self.symbol('{')
+        for dec in node.var_decs:
+            self.open_tag('varDec')
+            self.keyword('var')
+            self.write_names(dec.type, dec.names)
+            self.close_tag('varDec')
+        self.write_statements(node.statements)
+        self.symbol('}')
+        self.close_tag('subroutineBody')
+        self.close_tag('subroutineDec')
+
+    # --- GRAMMAR: Statements ---
+
+    def write_statements(self, statements):
+        self.open_tag('statements')
+        for statement in statements:
+            self.statement_writers[type(statement)](statement)
+        self.close_tag('statements')
+
+    def write_let(self, node):
+        self.open_tag('letStatement')
+        self.keyword('let')
+        self.identifier(node.name)
+        if node.index is not None:
+            self.symbol('[')
+            self.write_expression(node.index)
+            self.symbol(']')
+        self.symbol('=')
+        self.write_expression(node.value)
+        self.symbol(';')
+        self.close_tag('letStatement')
+
+    def write_do(self, node):
+        self.open_tag('doStatement')
+        self.keyword('do')
+        self.write_call(node.call)
+        self.symbol(';')
+        self.close_tag('doStatement')
+
+    def write_while(self, node):
+        self.open_tag('whileStatement')
+        self.keyword('while')
+        self.write_block(node.condition, node.statements)
+        self.close_tag('whileStatement')
+
+    def write_return(self, node):
+        self.open_tag('returnStatement')
+        self.keyword('return')
+        if node.value is not None:
+            self.write_expression(node.value)
+        self.symbol(';')
+        self.close_tag('returnStatement')
+
+    def write_if(self, node):
+        self.open_tag('ifStatement')
+        self.keyword('if')
+        self.write_block(node.condition, node.statements)
+        if node.else_statements is not None:
+            self.keyword('else')
+            self.symbol('{')
+            self.write_statements(node.else_statements)
+            self.symbol('}')
+        self.close_tag('ifStatement')
+
+    def write_block(self, condition, statements):
+        # '(' expression ')' '{' statements '}'
+        self.symbol('(')
+        self.write_expression(condition)
+        self.symbol(')')
+        self.symbol('{')
+        self.write_statements(statements)
+        self.symbol('}')
+
+    # --- GRAMMAR: Expressions ---
+
+    def write_expression(self, node):
+        # Rantai BinaryOp (nyambung ke kiri) balik jadi term (op term)*
+        tail = []
+        while type(node) is BinaryOp:
+            tail.append((node.op, node.right))
+            node = node.left
+        self.open_tag('expression')
+        self.write_term(node)
+        for op, term in reversed(tail):
+            self.symbol(SYMBOLS[op])
+            self.write_term(term)
+        self.close_tag('expression')
+
+    def write_term(self, node):
+        self.open_tag('term')
+        if node is not None:
+            self.term_writers[type(node)](node)
+        self.close_tag('term')
+
+    def write_unary(self, node):
+        self.symbol(SYMBOLS[node.op])
+        self.write_term(node.operand)
+
+    def write_group(self, node):
+        self.symbol('(')
+        self.write_expression(node.expression)
+        self.symbol(')')
+
+    def write_integer(self, node):
+        self.write_token('integerConstant', node.value)
+
+    def write_string(self, node):
+        self.write_token('stringConstant', node.value)
+
+    def write_keyword_constant(self, node):
+        self.keyword(KEYWORDS[node.keyword])
+
+    def write_var(self, node):
+        self.identifier(node.name)
+
+    def write_array(self, node):
+        self.identifier(node.name)
+        self.symbol('[')
+        self.write_expression(node.index)
+        self.symbol(']')
+
+    def write_call(self, node):
+        if node.receiver is not None:
+            self.identifier(node.receiver)
+            self.symbol('.')
+        self.identifier(node.name)
+        self.symbol('(')
+        self.open_tag('expressionList')
+        for i, argument in enumerate(node.arguments):
+            if i: self.symbol(',')
+            self.write_expression(argument)
+        self.close_tag('expressionList')
+        self.symbol(')')
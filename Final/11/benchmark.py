@@ -0,0 +1,236 @@
+import sys
+import os
+import time
+import random
+import argparse
+import tracemalloc
+import tempfile
+
+from JackTokenizer import JackTokenizer, TokenStream
+from JackParser import Parser
+from CodeGenerator import CodeGenerator
+from VMWriter import VMWriter
+
+# Helper benchmark (RSS, tracemalloc, JSON report) sama kayak Final/6
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from bench import peak_rss_kb, traced, run_isolated, write_report, compare
+
+# Benchmark compiler Jack: tokenize (-> TokenStream), parse (-> AST), dan
+# emit (AST -> .vm) diukur terpisah, tiap program di process baru. Memory
+# per fase diukur pake tracemalloc di satu run terpisah (gak ikut
+# di-timing).
+#
+#   python benchmark.py                                 # corpus + synthetic default
+#   python benchmark.py --sizes 100,1000 --depth 100 --output new.json --compare old.json
+#   python benchmark.py --no-corpus --sizes 500 --save-corpus gen/   # simpen .jack hasil generator
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FINAL_DIR = os.path.dirname(BASE_DIR)
+
+# Semua .jack di project 9-12 (app, test compiler, OS)
+CORPUS = ["9", "10", "11", "12"]
+
+OPS = ['+', '-', '*', '/', '&', '|', '<', '>', '=']
+TERMS = ['a', 'b', 'x', 'y', 'arr[a]', 'arr[x]', '-b', '~a', 'counter']
+STRING_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,;:!?-+*/=()<>&|"
+
+# --- SYNTHETIC PROGRAMS ---
+
+def nested_expression(rng, depth):
+    # Tiap level nambah satu pasang kurung: (expr op term) / (term op expr)
+    expr = rng.choice(TERMS)
+    for _ in range(depth):
+        op = rng.choice(OPS)
+        term = rng.choice(TERMS + [str(rng.randrange(1000))])
+        expr = f"({expr} {op} {term})" if rng.random() < 0.5 else f"({term} {op} {expr})"
+    return expr
+
+def generate_subroutine(rng, class_name, index, depth, string_length, array_size):
+    text = ''.join(rng.choice(STRING_CHARS) for _ in range(string_length))
+    lines = [
+        f"    /** Synthetic subroutine {index}. */",
+        f"    function int f{index}(int a, int b) {{",
+        "        var int x, y;",
+        "        var Array arr;",
+        "        var String s;",
+        f"        let arr = Array.new({max(array_size, 1)});",
+    ]
+    # Array gede: satu let per elemen
+    for i in range(array_size):
+        lines.append(f"        let arr[{i}] = {rng.choice(TERMS)} + {rng.randrange(32768)};")
+    lines += [
+        f'        let s = "{text}";',
+        "        do Output.printString(s);",
+        f"        let x = {nested_expression(rng, depth)};",
+        "        while (x > 0) {",
+        "            let x = x - 1;",
+        f"            let y = y + arr[x & {max(array_size - 1, 0)}];",
+        "        }",
+        "        if (x = y) {",
+        "            let counter = counter + 1;",
+        "        } else {",
+        "            let y = -x;",
+        "        }",
+    ]
+    if index > 0:
+        lines.append(f"        let y = {class_name}.f{index - 1}(x, y);")
+    lines += [
+        "        do s.dispose();",
+        "        do arr.dispose();",
+        "        return x + y;",
+        "    }",
+        "",
+    ]
+    return lines
+
+def generate_class(name="Synthetic", subroutines=100, depth=20, string_length=200,
+                   array_size=50, seed=0):
+    """
+    Generates the source of a valid Jack class.
+    subroutines: number of functions in the class.
+    depth: parenthesis nesting of the expression in every function.
+    string_length: length of the string literal in every function.
+    array_size: elements assigned one by one into an Array in every function.
+    """
+    rng = random.Random(seed)
+    lines = [f"class {name} {{", "    static int counter;", ""]
+    for index in range(subroutines):
+        lines += generate_subroutine(rng, name, index, depth, string_length, array_size)
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+# --- MEASUREMENT ---
+
+def tokenize(files):
+    return [TokenStream.from_file(p) for p in files]
+
+def parse(files, streams):
+    return [Parser(JackTokenizer(path, stream)).parse() for path, stream in zip(files, streams)]
+
+def emit(trees, outputs):
+    for tree, output in zip(trees, outputs):
+        vm_writer = VMWriter(output)
+        if tree is not None:
+            CodeGenerator(vm_writer).write_class(tree)
+        vm_writer.close()
+
+def corpus_files(rel):
+    files = []
+    for root, _, names in os.walk(os.path.join(FINAL_DIR, rel)):
+        files += [os.path.join(root, n) for n in names if n.endswith(".jack")]
+    return sorted(files)
+
+def measure(spec, repeat):
+    # Dijalanin di child process
+    with tempfile.TemporaryDirectory() as tmp:
+        if "paths" in spec:
+            files = spec["paths"]
+        else:
+            files = [os.path.join(tmp, "Synthetic.jack")]
+            with open(files[0], 'w') as f:
+                f.write(generate_class(**spec["synthetic"]))
+        source_bytes = sum(os.path.getsize(p) for p in files)
+
+        outputs = [os.path.join(tmp, f"out{i}.vm") for i in range(len(files))]
+
+        baseline_rss = peak_rss_kb()
+        best = {"tokenize": float('inf'), "parse": float('inf'), "emit": float('inf')}
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            streams = tokenize(files)
+            best["tokenize"] = min(best["tokenize"], time.perf_counter() - start)
+
+            start = time.perf_counter()
+            trees = parse(files, streams)
+            best["parse"] = min(best["parse"], time.perf_counter() - start)
+
+            start = time.perf_counter()
+            emit(trees, outputs)
+            best["emit"] = min(best["emit"], time.perf_counter() - start)
+
+            tokens = sum(len(s) for s in streams)
+            del streams, trees
+        peak_rss = peak_rss_kb()
+
+        # Run terpisah buat memory: tiap fase dapet peak-nya sendiri
+        alloc = {}
+        tracemalloc.start()
+        streams, alloc["tokenize"] = traced(tokenize, files)
+        trees, alloc["parse"] = traced(parse, files, streams)
+        _, alloc["emit"] = traced(emit, trees, outputs)
+        tracemalloc.stop()
+        del streams, trees
+
+        commands = 0
+        for output in outputs:
+            with open(output, 'r') as f:
+                commands += sum(1 for _ in f)
+
+    result = {
+        "name": spec["name"],
+        "files": len(files),
+        "source_bytes": source_bytes,
+        "tokens": tokens,
+        "vm_commands": commands,
+        "baseline_rss_kb": baseline_rss,
+        "peak_rss_kb": peak_rss,
+    }
+    for phase in ("tokenize", "parse", "emit"):
+        result[phase] = {
+            "seconds": best[phase],
+            "tokens_per_second": tokens / best[phase] if best[phase] else 0,
+            "peak_alloc_kb": alloc[phase],
+        }
+    return result
+
+# --- REPORT ---
+
+def print_result(result):
+    line = f"{result['name']:<24} {result['tokens']:>9} tok"
+    for phase in ("tokenize", "parse", "emit"):
+        p = result[phase]
+        line += f" | {phase} {p['tokens_per_second'] / 1e6:5.2f} M/s {p['peak_alloc_kb'] / 1024:6.1f} MB"
+    print(line + f" | rss {result['peak_rss_kb'] / 1024:6.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jack tokenizer/parser/emitter throughput benchmark")
+    parser.add_argument("--sizes", default="100,1000",
+                        help="comma separated synthetic class sizes (subroutines)")
+    parser.add_argument("--depth", type=int, default=20,
+                        help="expression nesting depth (keep below ~300, the parser is recursive)")
+    parser.add_argument("--string-length", type=int, default=200)
+    parser.add_argument("--array-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-corpus", action="store_true", help="skip the real Final/9-12 sources")
+    parser.add_argument("--save-corpus", help="also write the synthetic classes as .jack into this directory")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args()
+
+    specs = []
+    if not args.no_corpus:
+        for rel in CORPUS:
+            specs.append({"name": f"Final/{rel}", "paths": corpus_files(rel)})
+    for size in (int(s) for s in args.sizes.split(',') if s):
+        synthetic = {"subroutines": size, "depth": args.depth,
+                     "string_length": args.string_length, "array_size": args.array_size}
+        specs.append({"name": f"synthetic-{size}", "synthetic": synthetic})
+        if args.save_corpus:
+            os.makedirs(args.save_corpus, exist_ok=True)
+            name = f"Synthetic{size}"
+            with open(os.path.join(args.save_corpus, name + ".jack"), 'w') as f:
+                f.write(generate_class(name=name, **synthetic))
+
+    results = []
+    for spec in specs:
+        result = run_isolated(measure, spec, args.repeat)
+        print_result(result)
+        results.append(result)
+
+    synthetic = {"depth": args.depth, "string_length": args.string_length,
+                 "array_size": args.array_size}
+    write_report(args.output, BASE_DIR, results, repeat=args.repeat, synthetic=synthetic)
+
+    if args.compare:
+        compare(results, args.compare, ("tokenize", "parse", "emit"), "tokens_per_second", width=24)
@@ -1,71 +1,85 @@
 import sys
 import os
+import io
+import glob
+import time
+import mmap
+import argparse
+import tempfile
+import contextlib
+from array import array
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
 
 # --- 1. THE COMPLETE LOOKUP TABLES ---
+# Semua tabel nyimpen integer (bukan string '0'/'1'), encoding cukup pake
+# shift + or. Format ke teks cuma dilakuin di output stage.
 
 # Format Comp: a + c1 c2 c3 c4 c5 c6 (Total 7 bits)
 # Kalo di instruction ada 'M', bit 'a' (paling depan) pasti 1. Kalo pake 'A', bit 'a' jadi 0.
 comp_table = {
-    "0":   "0101010",
-    "1":   "0111111",
-    "-1":  "0111010",
-    "D":   "0001100",
-    "A":   "0110000",
-    "M":   "1110000",
-    "!D":  "0001101",
-    "!A":  "0110001",
-    "!M":  "1110001",
-    "-D":  "0001111",
-    "-A":  "0110011",
-    "-M":  "1110011",
-    "D+1": "0011111",
-    "A+1": "0110111",
-    "M+1": "1110111",
-    "D-1": "0001110",
-    "A-1": "0110010",
-    "M-1": "1110010",
-    "D+A": "0000010",
-    "D+M": "1000010",
-    "D-A": "0010011",
-    "D-M": "1010011",
-    "A-D": "0000111",
-    "M-D": "1000111",
-    "D&A": "0000000",
-    "D&M": "1000000",
-    "D|A": "0010101",
-    "D|M": "1010101"
+    "0":   0b0101010,
+    "1":   0b0111111,
+    "-1":  0b0111010,
+    "D":   0b0001100,
+    "A":   0b0110000,
+    "M":   0b1110000,
+    "!D":  0b0001101,
+    "!A":  0b0110001,
+    "!M":  0b1110001,
+    "-D":  0b0001111,
+    "-A":  0b0110011,
+    "-M":  0b1110011,
+    "D+1": 0b0011111,
+    "A+1": 0b0110111,
+    "M+1": 0b1110111,
+    "D-1": 0b0001110,
+    "A-1": 0b0110010,
+    "M-1": 0b1110010,
+    "D+A": 0b0000010,
+    "D+M": 0b1000010,
+    "D-A": 0b0010011,
+    "D-M": 0b1010011,
+    "A-D": 0b0000111,
+    "M-D": 0b1000111,
+    "D&A": 0b0000000,
+    "D&M": 0b1000000,
+    "D|A": 0b0010101,
+    "D|M": 0b1010101
 }
+# Bentuk komutatif (M+D, A&D, M|D, ...) yang keluar dari VM translator kita
+for comp in ["D+A", "D+M", "D&A", "D&M", "D|A", "D|M"]:
+    comp_table[comp[::-1]] = comp_table[comp]
 
 dest_table = {
-    "null": "000",
-    "M":    "001",
-    "D":    "010",
-    "MD":   "011",
-    "A":    "100",
-    "AM":   "101",
-    "AD":   "110",
-    "AMD":  "111"
+    "null": 0b000,
+    "M":    0b001,
+    "D":    0b010,
+    "MD":   0b011,
+    "A":    0b100,
+    "AM":   0b101,
+    "AD":   0b110,
+    "AMD":  0b111
 }
 
 jump_table = {
-    "null": "000",
-    "JGT":  "001",
-    "JEQ":  "010",
-    "JGE":  "011",
-    "JLT":  "100",
-    "JNE":  "101",
-    "JLE":  "110",
-    "JMP":  "111"
+    "null": 0b000,
+    "JGT":  0b001,
+    "JEQ":  0b010,
+    "JGE":  0b011,
+    "JLT":  0b100,
+    "JNE":  0b101,
+    "JLE":  0b110,
+    "JMP":  0b111
 }
 
-# Predefined Symbols
-symbol_table = {
+# Predefined Symbols (read-only, tiap Assembler clone sendiri)
+PREDEFINED_SYMBOLS = MappingProxyType({
     "SP": 0, "LCL": 1, "ARG": 2, "THIS": 3, "THAT": 4,
-    "SCREEN": 16384, "KBD": 24576
-}
-# Add R0..R15
-for i in range(16):
-    symbol_table[f"R{i}"] = i
+    "SCREEN": 16384, "KBD": 24576,
+    # R0..R15
+    **{f"R{i}": i for i in range(16)}
+})
 
 # --- 2. HELPER FUNCTIONS ---
 
@@ -83,9 +97,412 @@ def get_command_type(line):
         return "L_COMMAND"
     return "C_COMMAND"
 
-# --- 3. MAIN LOGIC (TWO PASS) ---
+# Cache encoding per teks instruksi. Assembly hasil VM translator isinya
+# puluhan instruksi yang sama diulang ribuan kali (@SP, AM=M-1, D=M, ...)
+c_command_cache = {}
+
+def translate_c_command(line):
+    word = c_command_cache.get(line)
+    if word is None:
+        word = c_command_cache[line] = encode_c_command(line)
+    return word
+
+def encode_c_command(line):
+    # dest=comp;jump
+    # Parsing logic
+    dest = "null"
+    comp = ""
+    jump = "null"
+
+    temp = line
+
+    if ';' in temp:
+        parts = temp.split(';')
+        comp = parts[0]
+        jump = parts[1]
+        temp = comp # Sisa bagian comp buat di cek '='
+
+    if '=' in temp:
+        parts = temp.split('=')
+        dest = parts[0]
+        comp = parts[1]
+    else:
+        # Kalo ga ada '=', berarti sisanya adalah comp (setelah split ;)
+        if ';' not in line: # Kasus comp doang (jarang, tapi mungkin)
+            comp = temp
+
+    # Translation (KeyError kalo mnemonic-nya ngaco)
+    comp_bits = comp_table[comp]
+    dest_bits = dest_table[dest]
+    jump_bits = jump_table[jump]
+
+    # Format C-instruction: 111 a c1-c6 d1-d3 j1-j3
+    # comp_bits di atas udah include 'a' (7 bits)
+    return 0b111 << 13 | comp_bits << 6 | dest_bits << 3 | jump_bits
+
+# --- 3. OUTPUT FORMATS ---
+
+# "hack" = format teks standar (16 char '0'/'1' per baris)
+# "bin"  = packed little-endian uint16, 2 byte per instruksi
+
+def output_path(input_file, fmt):
+    ext = '.' + fmt
+    output_filename = input_file.replace('.asm', ext)
+    # Handle kalo extensionnya bukan .asm (misal input tanpa extension)
+    if output_filename == input_file:
+        output_filename += ext
+    return output_filename
+
+def write_hack_text(output_filename, words):
+    # Program biasanya cuma punya sedikit word unik, format sekali aja per word
+    text_cache = {}
+    with open(output_filename, 'w') as f:
+        for word in words:
+            word &= 0xFFFF
+            text = text_cache.get(word)
+            if text is None:
+                text = text_cache[word] = f"{word:016b}\n"
+            f.write(text)
+
+def pack_words(words):
+    buf = array('H', (word & 0xFFFF for word in words))
+    # File selalu little-endian, apapun byte order mesinnya
+    if sys.byteorder != 'little':
+        buf.byteswap()
+    return buf
+
+def write_hack_bin(output_filename, words):
+    with open(output_filename, 'wb') as f:
+        pack_words(words).tofile(f)
+
+def write_symbol_file(output_filename, asm):
+    # Satu symbol per baris: "label NAMA ALAMAT_ROM" / "var NAMA ALAMAT_RAM"
+    with open(output_filename, 'w') as f:
+        for name, address in asm.labels.items():
+            f.write(f"label {name} {address}\n")
+        for name, address in asm.variables.items():
+            f.write(f"var {name} {address}\n")
+
+def load_symbol_file(filename):
+    """Returns (labels, variables) dicts read from a .sym file."""
+    tables = {"label": {}, "var": {}}
+    with open(filename, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[0] in tables:
+                tables[parts[0]][parts[1]] = int(parts[2])
+    return tables["label"], tables["var"]
+
+def load_rom(filename):
+    """
+    Loads a ROM image as a sequence of 16-bit words.
+    Binary images are memory-mapped (no per-line parsing), text .hack
+    files are parsed line by line.
+    """
+    if not filename.endswith('.bin'):
+        with open(filename, 'r') as f:
+            return array('H', (int(line, 2) for line in f if line.strip()))
+
+    with open(filename, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return array('H')
+        # mmap tetap hidup selama memoryview-nya masih dipake
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if sys.byteorder != 'little':
+        rom = array('H')
+        rom.frombytes(mm)
+        rom.byteswap()
+        mm.close()
+        return rom
+    return memoryview(mm).cast('H')
+
+# --- 4. PEEPHOLE OPTIMIZER (-O) ---
+# Jalan sebelum pass 1, langsung di level teks assembly. Rule dicek di
+# ujung buffer tiap ada baris baru masuk, jadi hasil replace bisa langsung
+# bikin match baru (sampe fixpoint). Label = batas keras: gak ada rule yang
+# boleh match nyebrang label, karena label bisa jadi target jump.
+#
+# Pattern: string literal, atau "{NAMA}" = wildcard (nama yang sama harus
+# isinya sama). Baris label gak pernah match elemen pattern apapun.
+#
+# Catatan: alamat ROM berubah, jadi program yang lompat pake angka ROM
+# langsung (@123 / 0;JMP) jangan dikasih -O. Pake label.
+
+def is_c_command(line):
+    return get_command_type(line) == "C_COMMAND"
+
+def writes_a(line):
+    return '=' in line and 'A' in line.split('=')[0]
+
+PEEPHOLE_RULES = [
+    # M++ lalu AM=M-1 di alamat yang sama (biasanya SP++ lalu SP--):
+    # memory balik ke nilai awal, yang tersisa cuma A=M
+    # (@SP kedua udah dibuang duluan sama reload_a)
+    ("inc_dec",
+     ["M=M+1", "AM=M-1"],
+     ["A=M"], None),
+    # Habis nulis ke top of stack, A masih nunjuk ke situ
+    # (asumsi: SP gak pernah nunjuk ke RAM[0] sendiri)
+    ("reload_stack_top",
+     ["@SP", "A=M", "M=D", "@SP", "A=M"],
+     ["@SP", "A=M", "M=D"], None),
+    # M=D lalu D=M: baca balik nilai yang barusan ditulis
+    ("load_after_store",
+     ["M=D", "D=M"],
+     ["M=D"], None),
+    # D=M lalu M=D di alamat yang sama: nulis balik nilai yang sama
+    ("store_after_load",
+     ["D=M", "M=D"],
+     ["D=M"], None),
+    # @X, instruksi yang gak nyentuh A, @X lagi -> reload gak perlu
+    ("reload_a",
+     ["@{X}", "{C}", "@{X}"],
+     ["@{X}", "{C}"],
+     lambda opt, cap: is_c_command(cap["C"]) and not writes_a(cap["C"])),
+    # @X langsung ditimpa @Y -> @X mati
+    ("dead_a_load",
+     ["@{X}", "@{Y}"],
+     ["@{Y}"],
+     lambda opt, cap: opt.is_constant(cap["X"])),
+]
+
+def match_element(element, line, captures):
+    if line.startswith("("):
+        return False
+    if '{' not in element:
+        return element == line
+    prefix, rest = element.split('{', 1)
+    name, suffix = rest.split('}', 1)
+    if not (line.startswith(prefix) and line.endswith(suffix)):
+        return False
+    value = line[len(prefix):len(line) - len(suffix)]
+    if name in captures:
+        return captures[name] == value
+    captures[name] = value
+    return True
+
+def fill_template(element, captures):
+    for name, value in captures.items():
+        element = element.replace('{' + name + '}', value)
+    return element
+
+class Peephole:
+    # Buffer dibatasin biar tetep bisa dipake di streaming mode
+    MAX_BUFFER = 64
+
+    def __init__(self, labels, rules=PEEPHOLE_RULES):
+        self.labels = labels
+        self.rules = rules
+        self.removed = {name: 0 for name, _, _, _ in rules}
+        self.keep = max(len(pattern) for _, pattern, _, _ in rules)
+
+    def is_constant(self, symbol):
+        # Aman dibuang kalo bukan variable. Buang referensi variable bisa
+        # ngegeser alokasi RAM variable lain (16, 17, ...).
+        return symbol.isdigit() or symbol in PREDEFINED_SYMBOLS or symbol in self.labels
+
+    def apply_rules(self, buffer):
+        changed = True
+        while changed:
+            changed = False
+            for name, pattern, replacement, guard in self.rules:
+                n = len(pattern)
+                if len(buffer) < n: continue
+                window = buffer[-n:]
+                captures = {}
+                if not all(match_element(e, l, captures) for e, l in zip(pattern, window)):
+                    continue
+                if guard is not None and not guard(self, captures):
+                    continue
+                buffer[-n:] = [fill_template(e, captures) for e in replacement]
+                self.removed[name] += n - len(replacement)
+                changed = True
+                break
+
+    def run(self, lines):
+        """Yields optimized instruction/label lines (comments already stripped)."""
+        buffer = []
+        for line in lines:
+            line = clean_line(line)
+            if not line: continue
+
+            if line.startswith("("):
+                yield from buffer
+                buffer.clear()
+                yield line
+                continue
+
+            buffer.append(line)
+            self.apply_rules(buffer)
+            if len(buffer) > self.MAX_BUFFER:
+                flush = len(buffer) - self.keep
+                yield from buffer[:flush]
+                del buffer[:flush]
+        yield from buffer
+
+    def total_removed(self):
+        return sum(self.removed.values())
+
+    def report(self):
+        print(f"Peephole: removed {self.total_removed()} instructions")
+        for name, count in self.removed.items():
+            print(f"  {name:<18} {count}")
+
+def collect_labels(lines):
+    labels = set()
+    for line in lines:
+        line = clean_line(line)
+        if line.startswith("("):
+            labels.add(line[1:-1])
+    return labels
+
+def peephole(lines):
+    """Optimizes a list of source lines. Returns (optimized_lines, Peephole)."""
+    opt = Peephole(collect_labels(lines))
+    return list(opt.run(lines)), opt
+
+# --- 5. ASSEMBLER (LIBRARY API) ---
+# Semua state (label + variable) ada di object, bukan global. Satu object
+# = satu program, jadi aman dipake dari thread lain / service yang hidup
+# lama, dan emulator/build driver bisa manggil in-process.
+
+class AssemblerError(Exception):
+    pass
+
+class Assembler:
+    # Jumlah entry fixup (2 per referensi) yang ditahan di memory sebelum di-spill
+    FIXUP_BUFFER = 1 << 16
+
+    def __init__(self):
+        # Clone dari tabel predefined yang frozen (cuma 23 entry, murah)
+        self.symbols = dict(PREDEFINED_SYMBOLS)
+        self.ram_address = 16 # User variables start at 16
+        # Dicatat terpisah buat symbol file (.sym)
+        self.labels = {}
+        self.variables = {}
+
+    def encode_c(self, line):
+        try:
+            return translate_c_command(line)
+        except KeyError as e:
+            raise AssemblerError(f"Instruction '{line}' contains unknown mnemonic {e}")
+
+    def resolve(self, symbol):
+        if symbol.isdigit():
+            return int(symbol)
+        # Variable handling
+        if symbol not in self.symbols:
+            self.symbols[symbol] = self.variables[symbol] = self.ram_address
+            self.ram_address += 1
+        return self.symbols[symbol]
+
+    def first_pass(self, lines):
+        # PASS 1: Symbol Table Construction
+        rom_address = 0
+        instructions = []
+
+        for line in lines:
+            line = clean_line(line)
+            if not line: continue
+
+            if get_command_type(line) == "L_COMMAND":
+                # (LOOP) -> LOOP
+                # Label merujuk ke instruksi BERIKUTNYA (rom_address saat ini)
+                self.symbols[line[1:-1]] = self.labels[line[1:-1]] = rom_address
+            else:
+                # Instruction biasa nambah counter
+                rom_address += 1
+                instructions.append(line)
+        return instructions
 
-def assemble(input_file):
+    def second_pass(self, instructions):
+        # PASS 2: Code Generation
+        words = []
+        for line in instructions:
+            if get_command_type(line) == "A_COMMAND":
+                # @xxx -> 16-bit word (0vvvvvvvvvvvvvvv)
+                words.append(self.resolve(line[1:]))
+            else:
+                words.append(self.encode_c(line))
+        return words
+
+    def assemble(self, lines):
+        """Assembles an iterable of source lines, returns the list of words."""
+        return self.second_pass(self.first_pass(lines))
+
+    def stream(self, lines, emit, patch):
+        """
+        Single-pass assembly. emit(word) is called for every instruction in
+        ROM order; patch(address, word) fixes a word that was already emitted.
+        Fixups are spilled to a temporary file and patched after the last
+        emit, in ascending address order. Memory is O(labels + distinct
+        unresolved symbols): the label table has to stay for backward
+        references, everything proportional to the program size does not.
+        """
+        # Fixup = pasangan (alamat ROM, id symbol). Id dikasih sesuai urutan
+        # kemunculan pertama, jadi alokasi variable sama kayak two-pass.
+        pending = {}
+        fixups = array('L')
+        rom_address = 0
+
+        with tempfile.TemporaryFile() as spill:
+            for line in lines:
+                line = clean_line(line)
+                if not line: continue
+
+                cmd_type = get_command_type(line)
+
+                if cmd_type == "L_COMMAND":
+                    label = line[1:-1]
+                    self.symbols[label] = self.labels[label] = rom_address
+                    continue
+
+                if cmd_type == "A_COMMAND":
+                    symbol = line[1:]
+                    if symbol.isdigit() or symbol in self.symbols:
+                        emit(self.resolve(symbol))
+                    else:
+                        # Belum tau ini label (forward ref) atau variable
+                        fixups.append(rom_address)
+                        fixups.append(pending.setdefault(symbol, len(pending)))
+                        if len(fixups) >= self.FIXUP_BUFFER:
+                            fixups.tofile(spill)
+                            del fixups[:]
+                        emit(0)
+                else:
+                    emit(self.encode_c(line))
+
+                rom_address += 1
+
+            # Symbol yang gak pernah jadi label = variable (16, 17, ...)
+            values = [self.resolve(symbol) for symbol in pending]
+            pending.clear()
+
+            fixups.tofile(spill)
+            spill.seek(0)
+            while True:
+                chunk = array('L')
+                try:
+                    chunk.fromfile(spill, self.FIXUP_BUFFER)
+                except EOFError:
+                    pass # Chunk terakhir (isinya tetap kebaca)
+                if not chunk: break
+                for i in range(0, len(chunk), 2):
+                    patch(chunk[i], values[chunk[i + 1]])
+
+def assemble_words(lines):
+    """Assembles source lines with fresh symbol state. Returns list[int]."""
+    return Assembler().assemble(lines)
+
+def assemble_bytes(lines):
+    """Same as assemble_words, packed as little-endian uint16 (.bin layout)."""
+    return pack_words(assemble_words(lines)).tobytes()
+
+# --- 6. FILE FRONTEND (TWO PASS) ---
+
+def assemble(input_file, formats=("hack",), optimize=False):
     print(f"Processing {input_file}...")
     
     # Baca file
@@ -94,106 +511,212 @@ def assemble(input_file):
             raw_lines = f.readlines()
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found.")
-        return
+        return False
 
-    # PASS 1: Symbol Table Construction
-    rom_address = 0
-    clean_lines = []
-    
-    for line in raw_lines:
-        line = clean_line(line)
-        if not line: continue 
-        
-        cmd_type = get_command_type(line)
-        
-        if cmd_type == "L_COMMAND":
-            # (LOOP) -> LOOP
-            label = line[1:-1]
-            # Label merujuk ke instruksi BERIKUTNYA (rom_address saat ini)
-            symbol_table[label] = rom_address
+    if optimize:
+        raw_lines, opt = peephole(raw_lines)
+        opt.report()
+
+    asm = Assembler()
+    try:
+        words = asm.assemble(raw_lines)
+    except AssemblerError as e:
+        print(f"SYNTAX ERROR: {e}")
+        return False
+
+    # Write output (semua format dari satu kali pass)
+    for fmt in formats:
+        output_filename = output_path(input_file, fmt)
+        if fmt == "bin":
+            write_hack_bin(output_filename, words)
+        elif fmt == "sym":
+            write_symbol_file(output_filename, asm)
         else:
-            # Instruction biasa nambah counter
-            rom_address += 1
-            clean_lines.append(line)
+            write_hack_text(output_filename, words)
+        print(f"Done! Output saved to: {output_filename}")
+    return True
 
-    # PASS 2: Code Generation
-    output_filename = input_file.replace('.asm', '.hack')
-    # Handle kalo extensionnya bukan .asm (misal input tanpa extension)
-    if output_filename == input_file: 
-        output_filename += ".hack"
-        
-    output_lines = []
-    ram_address = 16 # User variables start at 16
-    
-    for line in clean_lines:
-        cmd_type = get_command_type(line)
-        
-        if cmd_type == "A_COMMAND":
-            # @xxx
-            symbol = line[1:]
-            
-            val = 0
-            if symbol.isdigit():
-                val = int(symbol)
-            else:
-                # Variable handling
-                if symbol not in symbol_table:
-                    symbol_table[symbol] = ram_address
-                    ram_address += 1
-                val = symbol_table[symbol]
-            
-            # 16-bit binary (0vvvvvvvvvvvvvvv)
-            binary = f"{val:016b}"
-            output_lines.append(binary)
-            
-        elif cmd_type == "C_COMMAND":
-            # dest=comp;jump
-            # Parsing logic
-            dest = "null"
-            comp = ""
-            jump = "null"
-            
-            temp = line
-            
-            if ';' in temp:
-                parts = temp.split(';')
-                comp = parts[0]
-                jump = parts[1]
-                temp = comp # Sisa bagian comp buat di cek '='
-            
-            if '=' in temp:
-                parts = temp.split('=')
-                dest = parts[0]
-                comp = parts[1]
+# --- 7. FILE FRONTEND (STREAMING, SINGLE PASS) ---
+# Baca .asm per baris dan langsung encode. Forward reference ke label yang
+# belum ketemu ditulis dulu sebagai placeholder, alamat ROM-nya dicatat di
+# fixup table (di-spill ke file sementara), terus di-backpatch sekaligus di
+# akhir langsung ke file output. Symbol yang sampe akhir file gak pernah jadi
+# label berarti variable (alokasi RAM 16++ sesuai urutan kemunculan
+# pertama, sama persis kayak versi two-pass). Yang tetap di memory cuma
+# tabel label + nama symbol yang belum ke-resolve.
+
+# Ukuran 1 record per format, biar bisa seek langsung ke alamat ROM
+RECORD_SIZE = {"hack": 17, "bin": 2}
+
+# Jumlah record per blok waktu backpatch
+PATCH_BLOCK = 1 << 14
+
+# Maksimal 65536 entry per format, jadi memory tetap kebatas
+record_cache = {"hack": {}, "bin": {}}
+
+def encode_record(word, fmt):
+    # Di-mask 16 bit biar ukuran record selalu fix
+    word &= 0xFFFF
+    cache = record_cache[fmt]
+    record = cache.get(word)
+    if record is None:
+        if fmt == "bin":
+            record = word.to_bytes(2, 'little')
+        else:
+            record = f"{word:016b}\n".encode('ascii')
+        cache[word] = record
+    return record
+
+def assemble_streaming(input_file, formats=("hack",), optimize=False):
+    print(f"Processing {input_file} (streaming)...")
+
+    try:
+        source = open(input_file, 'r')
+    except FileNotFoundError:
+        print(f"Error: File '{input_file}' not found.")
+        return False
+
+    opt = None
+    if optimize:
+        # Scan label dulu (baca file 2x, memory tetap flat)
+        opt = Peephole(collect_labels(source))
+        source.seek(0)
+
+    word_formats = [fmt for fmt in formats if fmt != "sym"]
+    output_filenames = [output_path(input_file, fmt) for fmt in word_formats]
+    outputs = [(open(name, 'w+b'), fmt) for name, fmt in zip(output_filenames, word_formats)]
+    writers = [(out.write, fmt) for out, fmt in outputs]
+    blocks = {} # file output -> [record pertama, isi blok]
+
+    def emit(word):
+        for write, fmt in writers:
+            write(encode_record(word, fmt))
+
+    def flush_block(out, fmt):
+        start, data = blocks.pop(out)
+        out.seek(start * RECORD_SIZE[fmt])
+        out.write(data)
+
+    def patch(address, word):
+        # Patch datang urut naik alamat ROM: satu blok record dibaca, diedit
+        # di memory, terus ditulis balik (bukan seek + write per patch)
+        for out, fmt in outputs:
+            size = RECORD_SIZE[fmt]
+            block = blocks.get(out)
+            if block is None or address >= block[0] + PATCH_BLOCK:
+                if block is not None:
+                    flush_block(out, fmt)
+                start = address - address % PATCH_BLOCK
+                out.seek(start * size)
+                block = blocks[out] = [start, bytearray(out.read(PATCH_BLOCK * size))]
+            offset = (address - block[0]) * size
+            block[1][offset:offset + size] = encode_record(word, fmt)
+
+    ok = True
+    asm = Assembler()
+    with source:
+        try:
+            asm.stream(opt.run(source) if opt else source, emit, patch)
+        except AssemblerError as e:
+            print(f"SYNTAX ERROR: {e}")
+            ok = False
+
+    for out, fmt in outputs:
+        if out in blocks:
+            flush_block(out, fmt)
+        out.close()
+
+    if not ok:
+        # Jangan ninggalin output setengah jadi
+        for name in output_filenames:
+            os.remove(name)
+        return False
+
+    if opt:
+        opt.report()
+    if "sym" in formats:
+        output_filenames.append(output_path(input_file, "sym"))
+        write_symbol_file(output_filenames[-1], asm)
+    for name in output_filenames:
+        print(f"Done! Output saved to: {name}")
+    return True
+
+# --- 8. BATCH MODE ---
+# Banyak file sekaligus (file, directory, atau glob) di process pool, jadi
+# CI gak perlu start interpreter baru per file.
+
+def expand_inputs(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.asm'))))
+        elif any(c in path for c in '*?['):
+            files.extend(sorted(glob.glob(path)))
+        else:
+            files.append(path)
+    # Buang duplikat, urutan tetap
+    return list(dict.fromkeys(files))
+
+def assemble_job(input_file, formats, streaming, optimize=False):
+    # Jalan di worker process (symbol state per file ada di Assembler)
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        try:
+            if streaming:
+                ok = assemble_streaming(input_file, formats, optimize)
             else:
-                # Kalo ga ada '=', berarti sisanya adalah comp (setelah split ;)
-                if ';' not in line: # Kasus comp doang (jarang, tapi mungkin)
-                    comp = temp
-
-            # Translation
-            try:
-                comp_bits = comp_table[comp]
-                dest_bits = dest_table[dest]
-                jump_bits = jump_table[jump]
-                
-                # Format C-instruction: 111 a c1-c6 d1-d3 j1-j3
-                # comp_bits di atas udah include 'a' (7 bits)
-                output_lines.append(f"111{comp_bits}{dest_bits}{jump_bits}")
-                
-            except KeyError as e:
-                print(f"SYNTAX ERROR: Instruction '{line}' contains unknown mnemonic {e}")
-                return
-
-    # Write output
-    with open(output_filename, 'w') as f:
-        for bit_line in output_lines:
-            f.write(bit_line + '\n')
-            
-    print(f"Done! Output saved to: {output_filename}")
+                ok = assemble(input_file, formats, optimize)
+        except Exception as e:
+            print(f"Error: {input_file}: {e}")
+            ok = False
+    return ok, time.perf_counter() - start, log.getvalue()
+
+def assemble_batch(input_files, formats=("hack",), streaming=False, jobs=None, optimize=False):
+    """Assembles every file in a process pool. Returns the number of failed files."""
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(assemble_job, f, formats, streaming, optimize) for f in input_files]
+        for input_file, future in zip(input_files, futures):
+            ok, elapsed, log = future.result()
+            status = "OK" if ok else "FAIL"
+            print(f"[{status:>4}] {input_file} ({elapsed * 1000:.1f} ms)")
+            if not ok:
+                failed += 1
+                print(log, end='')
+
+    print(f"{len(input_files) - failed}/{len(input_files)} files assembled in {time.perf_counter() - start:.2f} s")
+    return failed
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python assembler.py <file.asm>")
+    parser = argparse.ArgumentParser(description="Hack assembler")
+    parser.add_argument("inputs", nargs='+', help=".asm file(s), directories or glob patterns")
+    parser.add_argument("--stream", action="store_true", help="single-pass streaming mode")
+    parser.add_argument("--bin", action="store_true", help="write packed binary .bin instead of .hack")
+    parser.add_argument("--both", action="store_true", help="write both .hack and .bin")
+    parser.add_argument("--sym", action="store_true", help="also write a .sym symbol file (labels and variables)")
+    parser.add_argument("-O", dest="optimize", action="store_true", help="run the peephole optimizer before pass 1")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes for batch mode")
+    args = parser.parse_args()
+
+    formats = ("hack",)
+    if args.both:
+        formats = ("hack", "bin")
+    elif args.bin:
+        formats = ("bin",)
+    if args.sym:
+        formats += ("sym",)
+
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print("Error: no .asm files found.")
+        sys.exit(1)
+
+    batch = len(args.inputs) > 1 or input_files != args.inputs
+    if batch:
+        sys.exit(1 if assemble_batch(input_files, formats, args.stream, args.jobs, args.optimize) else 0)
+    elif args.stream:
+        sys.exit(0 if assemble_streaming(input_files[0], formats, args.optimize) else 1)
     else:
-        # Support processing multiple files at once if needed, but standard is one
-        assemble(sys.argv[1])
\ No newline at end of file
+        sys.exit(0 if assemble(input_files[0], formats, args.optimize) else 1)
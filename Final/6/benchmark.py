@@ -0,0 +1,208 @@
+import sys
+import os
+import time
+import random
+import argparse
+import tracemalloc
+
+from assembler import Assembler
+import emulator
+
+# Helper benchmark (RSS, tracemalloc, JSON report) dipake bareng sama Final/11
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from bench import peak_rss_kb, traced, run_isolated, write_report, compare
+
+# Benchmark throughput assembler (pass 1 dan pass 2 diukur terpisah).
+# Tiap program diukur di process baru biar peak RSS-nya gak kecampur.
+# Memory per pass diukur pake tracemalloc di satu run terpisah (gak
+# ikut di-timing), karena ru_maxrss itu high-water mark satu process.
+#
+#   python benchmark.py                          # corpus + synthetic default
+#   python benchmark.py --sizes 1000000,4000000 --output new.json --compare old.json
+#   python benchmark.py --compile --steps 5000000    # + emulator run() vs run_compiled()
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CORPUS = [
+    "pong/Pong.asm",
+    "pong/PongL.asm",
+    "rect/Rect.asm",
+    "rect/RectL.asm",
+    "max/Max.asm",
+    "max/MaxL.asm",
+]
+
+# Potongan C-instruction yang sering keluar dari VM translator
+C_COMMANDS = [
+    "D=M", "D=A", "M=D", "AM=M-1", "A=M-1", "M=M+1", "M=M-1", "D=D+A",
+    "M=D+M", "M=M-D", "D=M-D", "A=A-1", "M=-1", "M=0", "M=!M", "D;JEQ",
+    "D;JGT", "D;JLT", "D;JNE", "0;JMP",
+]
+
+# --- SYNTHETIC PROGRAMS ---
+
+def generate_program(size, label_density=0.05, variables=100, seed=0):
+    """
+    Generates `size` instructions of valid Hack assembly.
+    label_density: fraction of instructions preceded by a label definition.
+    variables: number of distinct variable symbols referenced.
+    """
+    rng = random.Random(seed)
+    n_labels = max(1, int(size * label_density))
+    # Posisi label random (sorted), label direferensi maju & mundur
+    positions = sorted(rng.sample(range(size), min(n_labels, size)))
+
+    lines = []
+    next_label = 0
+    for rom_address in range(size):
+        while next_label < len(positions) and positions[next_label] == rom_address:
+            lines.append(f"(L{next_label})")
+            next_label += 1
+
+        roll = rng.random()
+        if roll < 0.15:
+            lines.append(f"@L{rng.randrange(len(positions))}")
+        elif roll < 0.30:
+            lines.append(f"@var{rng.randrange(variables)}")
+        elif roll < 0.45:
+            lines.append(f"@{rng.randrange(32768)}")
+        elif roll < 0.50:
+            lines.append("@SP")
+        else:
+            lines.append(rng.choice(C_COMMANDS))
+    return lines
+
+# --- MEASUREMENT ---
+
+def measure(spec, repeat):
+    # Dijalanin di child process
+    if "path" in spec:
+        with open(spec["path"], 'r') as f:
+            lines = f.readlines()
+    else:
+        lines = generate_program(**spec["synthetic"])
+
+    baseline_rss = peak_rss_kb()
+    best_pass1 = best_pass2 = float('inf')
+    instructions = []
+
+    for _ in range(repeat):
+        asm = Assembler()
+        start = time.perf_counter()
+        instructions = asm.first_pass(lines)
+        best_pass1 = min(best_pass1, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        asm.second_pass(instructions)
+        best_pass2 = min(best_pass2, time.perf_counter() - start)
+    peak_rss = peak_rss_kb()
+
+    # Run terpisah buat memory: tiap pass dapet peak-nya sendiri
+    tracemalloc.start()
+    asm = Assembler()
+    instructions, alloc_pass1 = traced(asm.first_pass, lines)
+    _, alloc_pass2 = traced(asm.second_pass, instructions)
+    tracemalloc.stop()
+
+    count = len(instructions)
+    return {
+        "name": spec["name"],
+        "source_lines": len(lines),
+        "instructions": count,
+        "baseline_rss_kb": baseline_rss,
+        "peak_rss_kb": peak_rss,
+        "pass1": {
+            "seconds": best_pass1,
+            "instructions_per_second": count / best_pass1 if best_pass1 else 0,
+            "peak_alloc_kb": alloc_pass1,
+        },
+        "pass2": {
+            "seconds": best_pass2,
+            "instructions_per_second": count / best_pass2 if best_pass2 else 0,
+            "peak_alloc_kb": alloc_pass2,
+        },
+    }
+
+def measure_emulator(spec, steps, repeat):
+    # Dijalanin di child process: block_cache masih kosong di run pertama
+    with open(spec["path"], 'r') as f:
+        rom = Assembler().assemble(f.readlines())
+
+    def timed(method):
+        machine = emulator.HackMachine(rom)
+        start = time.perf_counter()
+        executed = getattr(machine, method)(steps)
+        return executed, time.perf_counter() - start
+
+    def phase(executed, seconds):
+        return {"seconds": seconds, "instructions_per_second": executed / seconds if seconds else 0}
+
+    # Run compiled pertama ikut bayar compile, sisanya pake block yang udah di-cache
+    executed, cold = timed("run_compiled")
+    warm = min(timed("run_compiled")[1] for _ in range(repeat))
+    interpreted = min(timed("run")[1] for _ in range(repeat))
+    return {
+        "name": f"emulate {spec['name']}",
+        "instructions": executed,
+        "run": phase(executed, interpreted),
+        "compiled": phase(executed, cold),
+        "compiled_warm": phase(executed, warm),
+    }
+
+# --- REPORT ---
+
+def print_result(result):
+    p1, p2 = result["pass1"], result["pass2"]
+    print(f"{result['name']:<28} {result['instructions']:>9} instr | "
+          f"pass1 {p1['instructions_per_second'] / 1e6:6.2f} M/s {p1['peak_alloc_kb'] / 1024:7.1f} MB | "
+          f"pass2 {p2['instructions_per_second'] / 1e6:6.2f} M/s {p2['peak_alloc_kb'] / 1024:7.1f} MB | "
+          f"rss {result['peak_rss_kb'] / 1024:7.1f} MB")
+
+def print_emulator_result(result):
+    rates = [result[phase]["instructions_per_second"] for phase in ("run", "compiled", "compiled_warm")]
+    print(f"{result['name']:<28} {result['instructions']:>9} instr | "
+          f"run {rates[0] / 1e6:6.2f} M/s | compiled {rates[1] / 1e6:6.2f} M/s (x{rates[1] / rates[0]:4.1f}) | "
+          f"warm {rates[2] / 1e6:6.2f} M/s (x{rates[2] / rates[0]:4.1f})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assembler throughput benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma separated synthetic program sizes (instructions)")
+    parser.add_argument("--label-density", type=float, default=0.05)
+    parser.add_argument("--variables", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-corpus", action="store_true", help="skip the real .asm corpus")
+    parser.add_argument("--compile", action="store_true",
+                        help="also time the emulator, run() vs run_compiled(), on Pong")
+    parser.add_argument("--steps", type=int, default=5_000_000, help="emulator instructions per run")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args()
+
+    specs = []
+    if not args.no_corpus:
+        for rel in CORPUS:
+            specs.append({"name": rel, "path": os.path.join(BASE_DIR, rel)})
+    for size in (int(s) for s in args.sizes.split(',') if s):
+        specs.append({
+            "name": f"synthetic-{size}",
+            "synthetic": {"size": size, "label_density": args.label_density, "variables": args.variables},
+        })
+
+    results = []
+    for spec in specs:
+        result = run_isolated(measure, spec, args.repeat)
+        print_result(result)
+        results.append(result)
+
+    if args.compile:
+        spec = {"name": CORPUS[0], "path": os.path.join(BASE_DIR, CORPUS[0])}
+        result = run_isolated(measure_emulator, spec, args.steps, args.repeat)
+        print_emulator_result(result)
+        results.append(result)
+
+    write_report(args.output, BASE_DIR, results, repeat=args.repeat)
+
+    if args.compare:
+        compare(results, args.compare, ("pass1", "pass2", "run", "compiled", "compiled_warm"),
+                "instructions_per_second")
@@ -0,0 +1,195 @@
+import sys
+import os
+import time
+import argparse
+from array import array
+
+from assembler import (comp_table, dest_table, jump_table, PREDEFINED_SYMBOLS,
+                       Assembler, load_rom, load_symbol_file)
+
+# NumPy opsional: kalo ada, field a/comp/dest/jump diekstrak sekaligus
+# buat satu ROM (vectorized). Kalo gak ada, fallback ke array biasa.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# --- 1. INVERSE TABLES ---
+# Kebalikan dari comp_table/dest_table/jump_table di assembler.py.
+# setdefault: bentuk kanonik (D+M) menang lawan alias komutatif (M+D).
+
+COMP_NAMES = {}
+for name, bits in comp_table.items():
+    COMP_NAMES.setdefault(bits, name)
+DEST_NAMES = {bits: name for name, bits in dest_table.items()}
+JUMP_NAMES = {bits: name for name, bits in jump_table.items()}
+
+class DisassemblerError(Exception):
+    pass
+
+def c_command_text(comp, dest, jump):
+    # comp di sini 7 bit (a + c1..c6)
+    if comp not in COMP_NAMES:
+        raise DisassemblerError(f"unknown comp bits {comp:07b}")
+    text = COMP_NAMES[comp]
+    if dest:
+        text = f"{DEST_NAMES[dest]}={text}"
+    if jump:
+        text = f"{text};{JUMP_NAMES[jump]}"
+    return text
+
+# --- 2. FIELD EXTRACTION (SATU ROM SEKALIGUS) ---
+
+def decode_fields(rom):
+    """
+    Splits every word of the ROM into fields at once.
+    Returns (is_c, value, comp, dest, jump) as parallel sequences;
+    value is the 15-bit A-instruction constant, comp includes the 'a' bit.
+    """
+    if numpy is not None:
+        words = numpy.asarray(rom, dtype=numpy.uint16)
+        return (
+            (words >> 15).astype(bool),
+            words & 0x7FFF,
+            (words >> 6) & 0x7F,
+            (words >> 3) & 0b111,
+            words & 0b111,
+        )
+
+    words = array('H', rom)
+    return (
+        [w >> 15 for w in words],
+        [w & 0x7FFF for w in words],
+        [(w >> 6) & 0x7F for w in words],
+        [(w >> 3) & 0b111 for w in words],
+        [w & 0b111 for w in words],
+    )
+
+def decode_texts(rom):
+    """Returns the assembly text of every word (without symbol names)."""
+    # Word unik di satu program jauh lebih sedikit dari panjang ROM: tiap
+    # word unik di-decode sekali, lalu dipetakan balik lewat index inverse
+    if numpy is not None:
+        unique, inverse = numpy.unique(numpy.asarray(rom, dtype=numpy.uint16), return_inverse=True)
+        inverse = inverse.tolist()
+    else:
+        index = {}
+        inverse = [index.setdefault(word, len(index)) for word in rom]
+        unique = list(index)
+
+    # .tolist(): indexing elemen array NumPy satu-satu lebih lambat dari list
+    is_c, value, comp, dest, jump = (field if isinstance(field, list) else field.tolist()
+                                     for field in decode_fields(unique))
+    unique_texts = []
+    for i in range(len(is_c)):
+        if is_c[i]:
+            unique_texts.append(c_command_text(comp[i], dest[i], jump[i]))
+        else:
+            unique_texts.append(f"@{value[i]}")
+    return [unique_texts[i] for i in inverse]
+
+# --- 3. SYMBOL RESTORE ---
+
+def uses_memory(text):
+    # Instruksi yang baca/tulis M (A dipake sebagai alamat RAM)
+    if '=' in text:
+        dest, comp = text.split(';')[0].split('=')
+        return 'M' in dest or 'M' in comp
+    return 'M' in text.split(';')[0]
+
+def disassemble(rom, labels=None, variables=None):
+    """
+    Returns the list of assembly lines for a ROM image. With a symbol table
+    from the assembler, labels are put back and @value is replaced by the
+    symbol name where the next instruction uses A as a jump target (label)
+    or as a RAM address (variable / predefined symbol). The first @address
+    of each variable is always named, so re-assembly allocates the same RAM.
+    """
+    texts = decode_texts(rom)
+    labels = labels or {}
+    variables = variables or {}
+
+    labels_at = {}
+    for name, address in labels.items():
+        labels_at.setdefault(address, []).append(name)
+    label_names = {address: names[0] for address, names in labels_at.items()}
+    # R0..R4 juga alamat 0..4, tapi nama pointer VM yang dipake
+    ram_names = {PREDEFINED_SYMBOLS[name]: name for name in ('SP', 'LCL', 'ARG', 'THIS', 'THAT')}
+
+    # Variable dialokasi ulang (16, 17, ...) sesuai urutan kemunculan
+    # pertama @nama. Jadi kemunculan pertama @alamat tiap variable selalu
+    # dikasih nama, dan urutannya di ROM harus naik sesuai alamat. Begitu ada
+    # yang gak cocok, variable itu dan sesudahnya tetap numerik.
+    first_use = {}
+    for pc, text in enumerate(texts):
+        if text[0] == '@':
+            first_use.setdefault(int(text[1:]), pc)
+    var_first = {}
+    last = -1
+    for name, address in sorted(variables.items(), key=lambda item: item[1]):
+        pc = first_use.get(address, -1)
+        if address in ram_names or pc <= last: break
+        ram_names[address] = name
+        var_first[pc] = name
+        last = pc
+
+    lines = []
+    for pc, text in enumerate(texts):
+        for name in labels_at.get(pc, ()):
+            lines.append(f"({name})")
+        if pc in var_first:
+            text = f"@{var_first[pc]}"
+        elif text[0] == '@' and pc + 1 < len(texts):
+            value = int(text[1:])
+            following = texts[pc + 1]
+            if ';' in following and value in label_names:
+                text = f"@{label_names[value]}"
+            elif following[0] != '@' and uses_memory(following) and value in ram_names:
+                text = f"@{ram_names[value]}"
+        lines.append(text)
+    # Label di akhir program (nunjuk ke alamat setelah instruksi terakhir)
+    for name in labels_at.get(len(texts), ()):
+        lines.append(f"({name})")
+    return lines
+
+def round_trip(rom, lines):
+    """Re-assembles disassembled lines. Returns True if they give the same ROM."""
+    return Assembler().assemble(lines) == list(rom)
+
+# --- 4. CLI ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hack disassembler (.hack / .bin -> .asm)")
+    parser.add_argument("rom", help=".hack (text) or .bin (packed) ROM image")
+    parser.add_argument("-o", "--output", help="output .asm (default: <name>.dis.asm, '-' for stdout)")
+    parser.add_argument("--sym", help="symbol file from 'assembler.py --sym' (default: <name>.sym if it exists)")
+    parser.add_argument("--check", action="store_true", help="verify that re-assembling gives the same ROM")
+    args = parser.parse_args()
+
+    base = os.path.splitext(args.rom)[0]
+    sym_file = args.sym or base + ".sym"
+    labels = variables = None
+    if os.path.exists(sym_file):
+        labels, variables = load_symbol_file(sym_file)
+
+    start = time.perf_counter()
+    rom = load_rom(args.rom)
+    try:
+        lines = disassemble(rom, labels, variables)
+    except DisassemblerError as e:
+        print(f"Error: {args.rom}: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    output = args.output or base + ".dis.asm"
+    if output == '-':
+        sys.stdout.write('\n'.join(lines) + '\n')
+    else:
+        with open(output, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        print(f"{len(rom)} words disassembled in {elapsed * 1000:.1f} ms -> {output}")
+
+    if args.check:
+        ok = round_trip(rom, lines)
+        print("Round trip: OK" if ok else "Round trip: MISMATCH")
+        sys.exit(0 if ok else 1)
@@ -0,0 +1,709 @@
+import sys
+import os
+import time
+import hashlib
+import argparse
+from array import array
+
+from assembler import load_rom
+
+# Parser argumen --set/--ram (Final/common) dipake bareng sama VM interpreter di Final/8
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from ram_args import parse_assignments, parse_addresses
+
+# NumPy opsional: kalo gak ada, RAM pake array('H') biasa (sama-sama uint16)
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Hack Computer: ROM 32K, RAM 16K + Screen 8K + Keyboard (total 32K word)
+RAM_SIZE = 32768
+SCREEN = 16384
+SCREEN_WIDTH = 512
+SCREEN_HEIGHT = 256
+KBD = 24576
+
+# --- 1. DECODER ---
+# Tiap word ROM di-decode SEKALI sebelum jalan:
+#   A-instruction -> int (nilai yang di-load ke A)
+#   C-instruction -> tuple (comp_fn, pake_M, dest_bits, jump_bits)
+# Word yang sama share tuple yang sama, jadi tabelnya kecil.
+
+# comp 6-bit (c1..c6) -> fungsi (D, y) dengan y = A atau M (tergantung bit 'a')
+COMP_FUNCS = {
+    0b101010: lambda d, y: 0,
+    0b111111: lambda d, y: 1,
+    0b111010: lambda d, y: 0xFFFF,
+    0b001100: lambda d, y: d,
+    0b110000: lambda d, y: y,
+    0b001101: lambda d, y: d ^ 0xFFFF,
+    0b110001: lambda d, y: y ^ 0xFFFF,
+    0b001111: lambda d, y: -d & 0xFFFF,
+    0b110011: lambda d, y: -y & 0xFFFF,
+    0b011111: lambda d, y: (d + 1) & 0xFFFF,
+    0b110111: lambda d, y: (y + 1) & 0xFFFF,
+    0b001110: lambda d, y: (d - 1) & 0xFFFF,
+    0b110010: lambda d, y: (y - 1) & 0xFFFF,
+    0b000010: lambda d, y: (d + y) & 0xFFFF,
+    0b010011: lambda d, y: (d - y) & 0xFFFF,
+    0b000111: lambda d, y: (y - d) & 0xFFFF,
+    0b000000: lambda d, y: d & y,
+    0b010101: lambda d, y: d | y,
+}
+
+def alu(comp):
+    # Fallback buat kombinasi c-bit yang gak ada di tabel (tetap valid di CPU asli)
+    zx, nx, zy, ny, f, no = [(comp >> (5 - i)) & 1 for i in range(6)]
+    def fn(d, y):
+        x = 0 if zx else d
+        if nx: x ^= 0xFFFF
+        if zy: y = 0
+        if ny: y ^= 0xFFFF
+        out = (x + y) & 0xFFFF if f else x & y
+        return out ^ 0xFFFF if no else out
+    return fn
+
+# Penanda infinite loop yang gak ngubah state lagi -> emulator berhenti
+HALT = ("HALT",)
+
+def decode_word(word):
+    if not word & 0x8000:
+        return word
+    comp = (word >> 6) & 0x3F
+    fn = COMP_FUNCS.get(comp) or alu(comp)
+    return (fn, bool(word & 0x1000), (word >> 3) & 0b111, word & 0b111)
+
+def decode_rom(rom):
+    cache = {}
+    program = []
+    for word in rom:
+        op = cache.get(word)
+        if op is None:
+            op = cache[word] = decode_word(word)
+        program.append(op)
+
+    # "@h ; 0;JMP" mundur ke h: kalo loop-nya idle, jump-nya jadi HALT
+    for pc in range(1, len(program)):
+        op, start = program[pc], program[pc - 1]
+        if (op.__class__ is tuple and op[3] == 0b111 and start.__class__ is int
+                and pc - IDLE_LOOP_STEPS < start < pc and is_idle_loop(rom, start, pc)):
+            program[pc] = HALT
+    return program
+
+# --- IDLE LOOP DETECTION ---
+# Program Jack selalu berakhir di Sys.halt: "while (true) {}", yang
+# setelah translate jadi push/not/if-goto/goto, bukan cuma "@END 0;JMP".
+# Satu putaran loop dijalanin secara simbolik dari `start`: nilai bisa
+# konstanta ('k', v), nilai awal register/RAM + offset ('r', key, off), atau
+# None (gak ketauan). Loop dianggap idle (= halt) kalo semua jump-nya pasti
+# (kondisi konstanta), balik ke `start` lewat jump di `end`, dan state
+# akhirnya gak bergantung sama state awal selain yang gak berubah. Putaran
+# berikutnya berarti ngulang persis sama, selamanya.
+#
+# Asumsi: alamat simbolik (misal RAM[SP]) gak pernah sama dengan alamat
+# konstanta yang ditulis di loop yang sama (SP selalu >= 256).
+
+# Panjang maksimal satu putaran loop yang dicek
+IDLE_LOOP_STEPS = 64
+
+def shift(value, delta):
+    if value is None:
+        return None
+    if value[0] == 'k':
+        return ('k', (value[1] + delta) & 0xFFFF)
+    return ('r', value[1], (value[2] + delta) & 0xFFFF)
+
+def eval_comp(comp, d, y):
+    if comp == 0b001100: return d
+    if comp == 0b110000: return y
+    if comp == 0b011111: return shift(d, 1)
+    if comp == 0b110111: return shift(y, 1)
+    if comp == 0b001110: return shift(d, -1)
+    if comp == 0b110010: return shift(y, -1)
+    if comp == 0b000010 and d is not None and d[0] == 'k': return shift(y, d[1])
+    if comp == 0b000010 and y is not None and y[0] == 'k': return shift(d, y[1])
+    if comp == 0b010011 and y is not None and y[0] == 'k': return shift(d, -y[1])
+    if comp == 0b000111 and d is not None and d[0] == 'k': return shift(y, -d[1])
+    # Sisanya cuma bisa dihitung kalo operand yang kepake konstanta
+    # (bit zx / zy nyala = D / y gak dipake ALU)
+    d_value = 0 if comp & 0b100000 else (d[1] if d is not None and d[0] == 'k' else None)
+    y_value = 0 if comp & 0b001000 else (y[1] if y is not None and y[0] == 'k' else None)
+    if d_value is None or y_value is None:
+        return None
+    return ('k', (COMP_FUNCS.get(comp) or alu(comp))(d_value, y_value))
+
+def is_idle_loop(rom, start, end):
+    """True if the loop start..(jump at end) never changes the machine state after one turn."""
+    A, D = ('r', 'A', 0), ('r', 'D', 0)
+    writes = {} # alamat konstanta (int) / ('at', key, off) -> nilai
+
+    def address(a):
+        if a is None: return None
+        return a[1] & 0x7FFF if a[0] == 'k' else ('at', a[1], a[2])
+
+    def read(key):
+        if key in writes: return writes[key]
+        return ('r', key, 0) if key.__class__ is int else None
+
+    pc = start
+    for _ in range(IDLE_LOOP_STEPS):
+        if pc >= len(rom):
+            return False
+        word = rom[pc]
+        if not word & 0x8000:
+            A = ('k', word)
+            pc += 1
+            continue
+
+        comp, dest, jump = (word >> 6) & 0x3F, (word >> 3) & 0b111, word & 0b111
+        key = address(A)
+        y = (read(key) if key is not None else None) if word & 0x1000 else A
+        out = eval_comp(comp, D, y)
+        target = A
+        if dest & 1:
+            if key is None or out is None: return False
+            writes[key] = out
+        if dest & 2: D = out
+        if dest & 4: A = out
+
+        if not jump:
+            pc += 1
+            continue
+        if jump != 0b111:
+            if out is None or out[0] != 'k': return False
+            t = out[1]
+            if not jump & (2 if t == 0 else 4 if t & 0x8000 else 1):
+                pc += 1
+                continue
+        if target is None or target[0] != 'k':
+            return False
+        if target[1] == start:
+            break
+        pc = target[1]
+    else:
+        return False
+
+    if pc != end:
+        return False
+
+    # State akhir cuma boleh konstanta atau nilai awal dari register/RAM
+    # yang sendirinya gak berubah selama satu putaran
+    final = {'A': A, 'D': D}
+    def unchanged(key):
+        value = final[key] if key in final else writes.get(key, ('r', key, 0))
+        return value == ('r', key, 0)
+    def stable(value):
+        return value is not None and (value[0] == 'k' or unchanged(value[1]))
+
+    if not (stable(A) and stable(D)):
+        return False
+    for key, value in writes.items():
+        if not stable(value) or (key.__class__ is tuple and not unchanged(key[1])):
+            return False
+    return True
+
+# --- 2. BASIC-BLOCK COMPILER ---
+# Dispatch per instruksi itu mahal di Python. Mode ini motong ROM jadi basic
+# block mulai dari tiap alamat yang jadi target jump (di-compile setelah
+# COMPILE_THRESHOLD kali dilompatin), terus tiap block di-translate jadi satu
+# fungsi Python. RAM-nya list int biasa selama run_compiled jalan.
+# Jump bersyarat jadi side exit, fall-through dan jump statis tanpa syarat
+# (@LABEL 0;JMP) langsung disambung di fungsi yang sama. Block yang lompat
+# balik ke awalnya sendiri jadi while-loop.
+#
+# Di dalam block, A dan D gak langsung ditulis ke variable: nilainya
+# dibawa sebagai expression Python (atau konstanta, dihitung pas compile)
+# dan ditempel langsung ke instruksi yang make. Baru disimpen ke variable
+# sementara kalo dipake lebih dari sekali, atau kalo ada store ke RAM yang
+# bisa ngubah isinya. Register yang gak pernah dibaca lagi gak ditulis sama
+# sekali (cuma muncul di side exit).
+#
+# Hasil compile di-cache per hash ROM, jadi machine baru dengan ROM yang
+# sama gak compile ulang.
+
+# comp 6-bit -> template expression Python ({d} = D, {y} = A atau M)
+COMP_EXPR = {
+    0b101010: "0",
+    0b111111: "1",
+    0b111010: "65535",
+    0b001100: "{d}",
+    0b110000: "{y}",
+    0b001101: "{d} ^ 65535",
+    0b110001: "{y} ^ 65535",
+    0b001111: "-{d} & 65535",
+    0b110011: "-{y} & 65535",
+    0b011111: "({d} + 1) & 65535",
+    0b110111: "({y} + 1) & 65535",
+    0b001110: "({d} - 1) & 65535",
+    0b110010: "({y} - 1) & 65535",
+    0b000010: "({d} + {y}) & 65535",
+    0b010011: "({d} - {y}) & 65535",
+    0b000111: "({y} - {d}) & 65535",
+    0b000000: "{d} & {y}",
+    0b010101: "{d} | {y}",
+}
+
+# jump bits -> kondisi di nilai 16-bit unsigned {t}
+JUMP_COND = {
+    0b001: "0 < {t} < 32768",
+    0b010: "{t} == 0",
+    0b011: "{t} < 32768",
+    0b100: "{t} >= 32768",
+    0b101: "{t} != 0",
+    0b110: "{t} == 0 or {t} >= 32768",
+}
+
+block_cache = {} # hash ROM -> {pc: (fn, length)}
+
+def rom_hash(rom):
+    return hashlib.sha1(array('H', rom).tobytes()).hexdigest()
+
+# Panjang maksimal satu block (jumlah instruksi yang di-trace)
+MAX_BLOCK = 256
+
+# Penanda "baca RAM di alamat dinamis" di dependency expression
+DYNAMIC = -1
+
+# Block baru di-compile setelah dimasukin sebanyak ini (compile itu mahal,
+# kode yang cuma jalan sekali-dua kali mending di-interpret)
+COMPILE_THRESHOLD = 8
+
+def first_jump(program, pc):
+    """Number of instructions from pc up to and including the first jump (or halt)."""
+    size = len(program)
+    count = 0
+    while pc < size:
+        op = program[pc]
+        count += 1
+        if op is HALT or (op.__class__ is tuple and op[3]):
+            break
+        pc += 1
+    return max(count, 1)
+
+def jumps_taken(jump, t):
+    return bool(jump & (2 if t == 0 else 4 if t & 0x8000 else 1))
+
+def is_atom(expr):
+    """True if expr needs no parentheses: a name or one mem[...] subscript."""
+    if expr.isidentifier():
+        return True
+    if not (expr.startswith("mem[") and expr.endswith("]")):
+        return False
+    depth = 0
+    for i, char in enumerate(expr):
+        if char == "[": depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0 and i != len(expr) - 1:
+                return False
+    return True
+
+def trace_block(rom, program, start):
+    """
+    Follows control flow from `start` along fall-through edges and static
+    unconditional jumps. Returns (trace, next_pc): trace is a list of
+    (pc, word, action) with action None, "exit", "back" (jump to start) or
+    "follow"; next_pc is where execution continues after the last entry
+    (None if it ends with an unconditional jump).
+    """
+    size = len(program)
+    trace = []
+    visited = set()
+    known_a = None # nilai A yang pasti (hasil @xxx), None kalo dinamis
+    pc = start
+    while True:
+        if pc >= size or program[pc] is HALT or pc in visited or len(trace) >= MAX_BLOCK:
+            return trace, pc
+        visited.add(pc)
+        word = rom[pc]
+        if not word & 0x8000:
+            known_a = word
+            trace.append((pc, word, None))
+            pc += 1
+            continue
+
+        jump = word & 0b111
+        target = known_a
+        if word & 0b100000:
+            known_a = None
+        action = None
+        if jump:
+            if target == start:
+                action = "back"
+            elif jump != 0b111 or target is None:
+                action = "exit"
+            else:
+                action = "follow"
+        trace.append((pc, word, action))
+        if jump == 0b111:
+            if action != "follow":
+                return trace, None
+            pc = target
+        else:
+            pc += 1
+
+def count_uses(trace):
+    """
+    For every trace entry: how often A and D are read afterwards before being
+    redefined, and whether their value is still live (read, or returned at
+    a side exit) after it.
+    """
+    uses = [None] * len(trace)
+    count_a = count_d = 0
+    live_a = live_d = True # akhir trace = exit
+    for i in range(len(trace) - 1, -1, -1):
+        _, word, action = trace[i]
+        if action == "back":
+            # Balik ke awal loop: A dan D di-assign ke variable loop
+            count_a += 1
+            count_d += 1
+        if action:
+            live_a = live_d = True
+        uses[i] = (count_a, count_d, live_a, live_d)
+        if not word & 0x8000:
+            count_a = 0
+            live_a = False
+            continue
+        comp, dest = (word >> 6) & 0x3F, (word >> 3) & 0b111
+        if dest & 4: count_a, live_a = 0, False
+        if dest & 2: count_d, live_d = 0, False
+        if word & 0x1000 or dest & 1:
+            count_a += (1 if word & 0x1000 else 0) + (1 if dest & 1 else 0)
+        elif not comp & 0b001000:
+            count_a += 1
+        if not comp & 0b100000:
+            count_d += 1
+        live_a = live_a or count_a > 0
+        live_d = live_d or count_d > 0
+    return uses
+
+def compile_block(rom, program, start):
+    """
+    Compiles the code reachable from `start` along fall-through edges and
+    static unconditional jumps (side exits at every conditional jump) into
+    fn(A, D, mem, limit) -> (A, D, next_pc, steps), with mem a list.
+    A jump back to `start` loops inside fn while the steps already done
+    stay <= limit.
+    Returns (fn, max_length), or None if `start` is outside ROM / a halt loop.
+    """
+    if start >= len(program) or program[start] is HALT:
+        return None
+
+    trace, next_pc = trace_block(rom, program, start)
+    uses = count_uses(trace)
+    looping = any(action == "back" for _, _, action in trace)
+    pad = "    " if looping else ""
+    lines = ["s = 0", "while True:"] if looping else []
+    namespace = {}
+    temps = [0]
+
+    # Nilai register: int (konstanta) atau (teks expression, dependency RAM).
+    # Dependency = alamat RAM konstanta yang dibaca, DYNAMIC = alamat dinamis.
+    regs = {'A': ("A", frozenset()), 'D': ("D", frozenset())}
+
+    def text(value):
+        if value.__class__ is int:
+            return str(value)
+        return value[0] if is_atom(value[0]) else f"({value[0]})"
+
+    def address_of(value):
+        # "(x + 1) & 65535" & 32767 == "(x + 1) & 32767"
+        expr = value[0]
+        if expr.endswith(" & 65535"):
+            return expr[:-len(" & 65535")] + " & 32767"
+        return f"{text(value)} & 32767"
+
+    def deps(value):
+        return frozenset() if value.__class__ is int else value[1]
+
+    def emit(line):
+        lines.append(pad + line)
+
+    def materialize(value):
+        # Simpen expression ke variable sementara baru (tiap nama cuma
+        # di-assign sekali per putaran, jadi gak pernah basi)
+        if value.__class__ is int or value[0].isidentifier():
+            return value
+        temps[0] += 1
+        name = f"t{temps[0]}"
+        emit(f"{name} = {value[0]}")
+        return (name, frozenset())
+
+    def steps(count):
+        return f"s + {count}" if looping else str(count)
+
+    def exit_line(target, count):
+        return f"return {text(regs['A'])}, {text(regs['D'])}, {target}, {steps(count)}"
+
+    for i, (pc, word, action) in enumerate(trace):
+        count = i + 1
+        if not word & 0x8000:
+            regs['A'] = word
+            continue
+
+        comp = (word >> 6) & 0x3F
+        dest = (word >> 3) & 0b111
+        jump = word & 0b111
+        uses_a, uses_d, live_a, live_d = uses[i]
+
+        # Jump & tulis M pake nilai A yang LAMA
+        if jump and regs['A'].__class__ is not int:
+            regs['A'] = materialize(regs['A'])
+        a = regs['A']
+        d = regs['D']
+
+        if a.__class__ is int:
+            address = a & 0x7FFF
+            m = (f"mem[{address}]", frozenset((address,)))
+        else:
+            address = None
+            m = (f"mem[{address_of(a)}]", deps(a) | {DYNAMIC})
+        y = m if word & 0x1000 else a
+
+        # Operand yang gak kepake ALU (bit zx / zy) gak dihitung
+        d_used = not comp & 0b100000
+        y_used = not comp & 0b001000
+        d_value = d if d_used else 0
+        y_value = y if y_used else 0
+        if d_value.__class__ is int and y_value.__class__ is int:
+            out = (COMP_FUNCS.get(comp) or alu(comp))(d_value, y_value)
+        else:
+            if comp in COMP_EXPR:
+                expr = COMP_EXPR[comp].format(d=text(d_value), y=text(y_value))
+            else:
+                name = f"_alu{comp}"
+                namespace[name] = alu(comp)
+                expr = f"{name}({text(d_value)}, {text(y_value)})"
+            out = (expr, deps(d_value) | deps(y_value))
+
+        # Hasil dipake di lebih dari satu tempat -> simpen dulu
+        targets = (dest & 1) + (dest >> 1 & 1) + (dest >> 2) + (1 if jump and jump != 0b111 else 0)
+        if (targets > 1 or (dest & 4 and uses_a > 1) or (dest & 2 and uses_d > 1)):
+            out = materialize(out)
+
+        if dest & 1:
+            # Store bisa bikin expression register lain basi: simpen dulu
+            for reg, bit, live in (('A', 4, live_a), ('D', 2, live_d)):
+                value = regs[reg]
+                if dest & bit or not live or value.__class__ is int:
+                    continue
+                stale = (address in value[1] or DYNAMIC in value[1]) if address is not None else bool(value[1])
+                if stale:
+                    regs[reg] = materialize(value)
+            if address is not None:
+                emit(f"mem[{address}] = {text(out)}")
+            else:
+                emit(f"{m[0]} = {text(out)}")
+        if dest & 2: regs['D'] = out
+        if dest & 4: regs['A'] = out
+
+        if not jump:
+            continue
+        if jump == 0b111 or out.__class__ is int:
+            taken = jump == 0b111 or jumps_taken(jump, out)
+            cond = None
+        else:
+            taken = True
+            cond = JUMP_COND[jump].format(t=text(out))
+        if not taken:
+            continue
+
+        if action == "back":
+            prefix = pad
+            if cond:
+                emit(f"if {cond}:")
+                prefix = pad + "    "
+            new_a, new_d = text(regs['A']), text(regs['D'])
+            if (new_a, new_d) != ("A", "D"):
+                lines.append(prefix + f"A, D = {new_a}, {new_d}")
+            lines.append(prefix + f"s += {count}")
+            lines.append(prefix + "if s <= limit: continue")
+            lines.append(prefix + f"return A, D, {start}, s")
+        elif action == "exit":
+            line = exit_line(text(a), count)
+            emit(f"if {cond}: {line}" if cond else line)
+        # "follow": lanjut di target, A tetap = target
+
+    if next_pc is not None:
+        emit(exit_line(next_pc, len(trace)))
+
+    code = f"def block_{start}(A, D, mem, limit):\n" + "".join(f"    {line}\n" for line in lines)
+    exec(compile(code, f"<hack block {start}>", "exec"), namespace)
+    return namespace[f"block_{start}"], len(trace)
+
+# --- 3. MACHINE ---
+
+def new_ram():
+    if numpy is not None:
+        return numpy.zeros(RAM_SIZE, dtype=numpy.uint16)
+    return array('H', bytes(2 * RAM_SIZE))
+
+def execute(program, mem, A, D, pc, max_steps):
+    """
+    Interprets up to max_steps decoded instructions on mem (memoryview or
+    list). Returns (A, D, pc, steps, halted).
+    """
+    size = len(program)
+    steps = 0
+    while steps < max_steps:
+        if pc >= size:
+            # Lari keluar ROM: anggap berhenti
+            return A, D, pc, steps, True
+        op = program[pc]
+        if op.__class__ is int:
+            A = op
+            pc += 1
+            steps += 1
+            continue
+        if op is HALT:
+            return A, D, pc, steps, True
+        fn, use_m, dest, jump = op
+        out = fn(D, mem[A & 0x7FFF] if use_m else A)
+        address = A
+        if dest:
+            if dest & 1: mem[address & 0x7FFF] = out
+            if dest & 2: D = out
+            if dest & 4: A = out
+        steps += 1
+        if jump and jump & (2 if out == 0 else 4 if out & 0x8000 else 1):
+            pc = address
+        else:
+            pc += 1
+    return A, D, pc, steps, False
+
+class HackMachine:
+    def __init__(self, rom):
+        self.rom = rom
+        self.program = decode_rom(rom)
+        self.ram = new_ram()
+        # Akses per-word lewat memoryview: int Python biasa, baik numpy maupun array
+        self.mem = memoryview(self.ram)
+        # Block hasil compile di-share antar machine dengan ROM yang sama
+        self.blocks = block_cache.setdefault(rom_hash(rom), {})
+        self.entries = {} # pc -> [berapa kali dimasukin, panjang sampai jump pertama]
+        self.reset()
+
+    @classmethod
+    def from_file(cls, filename):
+        return cls(load_rom(filename))
+
+    def reset(self):
+        # Sama kayak pin reset CPU: RAM gak disentuh
+        self.A = 0
+        self.D = 0
+        self.pc = 0
+        self.steps = 0
+        self.halted = False
+
+    def run(self, max_steps):
+        """Executes up to max_steps instructions. Returns the number executed."""
+        self.A, self.D, self.pc, steps, halted = execute(
+            self.program, self.mem, self.A, self.D, self.pc, max_steps)
+        if halted:
+            self.halted = True
+        self.steps += steps
+        return steps
+
+    def run_compiled(self, max_steps):
+        """
+        Same as run(), but executes whole compiled blocks at a time. A block
+        start is interpreted until its first jump the first COMPILE_THRESHOLD
+        times it is reached, and compiled after that.
+        """
+        program = self.program
+        blocks = self.blocks
+        entries = self.entries
+        # Block jalan di list int biasa (index list jauh lebih cepet dari
+        # memoryview), disalin balik ke RAM pas selesai
+        mem = self.mem.tolist()
+        A, D, pc = self.A, self.D, self.pc
+        steps = 0
+        halted = False
+
+        while steps < max_steps and not halted:
+            remaining = max_steps - steps
+            block = blocks.get(pc)
+            if block is None:
+                entry = entries.get(pc)
+                if entry is None:
+                    entry = entries[pc] = [0, first_jump(program, pc)]
+                entry[0] += 1
+                if entry[0] <= COMPILE_THRESHOLD:
+                    # Masih dingin: interpret sampai jump pertama
+                    A, D, pc, n, halted = execute(program, mem, A, D, pc, min(entry[1], remaining))
+                    steps += n
+                    continue
+                block = compile_block(self.rom, program, pc)
+                if block is None:
+                    halted = True
+                    break
+                blocks[pc] = block
+            fn, length = block
+            if remaining < length:
+                # Sisa step gak cukup buat 1 block penuh: lanjut per instruksi
+                A, D, pc, n, halted = execute(program, mem, A, D, pc, remaining)
+                steps += n
+                break
+            A, D, pc, n = fn(A, D, mem, remaining - length)
+            steps += n
+
+        self.mem[:] = array('H', mem)
+        self.A, self.D, self.pc = A, D, pc
+        if halted:
+            self.halted = True
+        self.steps += steps
+        return steps
+
+    def peek(self, address, signed=False):
+        value = self.mem[address]
+        if signed and value & 0x8000:
+            value -= 0x10000
+        return value
+
+    def poke(self, address, value):
+        self.mem[address] = value & 0xFFFF
+
+    def write_screen_pbm(self, filename):
+        # Layar 512x256, 1 bit per pixel, bit 0 = pixel paling kiri
+        rows = []
+        for y in range(SCREEN_HEIGHT):
+            bits = []
+            base = SCREEN + y * (SCREEN_WIDTH // 16)
+            for x in range(SCREEN_WIDTH // 16):
+                word = self.mem[base + x]
+                bits.extend('1' if word >> b & 1 else '0' for b in range(16))
+            rows.append(' '.join(bits))
+        with open(filename, 'w') as f:
+            f.write(f"P1\n{SCREEN_WIDTH} {SCREEN_HEIGHT}\n" + '\n'.join(rows) + '\n')
+
+# --- 4. CLI ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Hack CPU emulator")
+    parser.add_argument("rom", help=".hack (text) or .bin (packed) ROM image")
+    parser.add_argument("--steps", type=int, default=10_000_000, help="max instructions to execute")
+    parser.add_argument("--set", default="", help="initial RAM values, e.g. 0=3,1=5")
+    parser.add_argument("--ram", default="", help="RAM addresses to print afterwards, e.g. 0-2,256")
+    parser.add_argument("--screen", help="write the screen as a PBM image")
+    parser.add_argument("--compile", action="store_true", help="run compiled basic blocks instead of single instructions")
+    args = parser.parse_args()
+
+    machine = HackMachine.from_file(args.rom)
+    for address, value in parse_assignments(args.set):
+        machine.poke(address, value)
+
+    start = time.perf_counter()
+    if args.compile:
+        steps = machine.run_compiled(args.steps)
+    else:
+        steps = machine.run(args.steps)
+    elapsed = time.perf_counter() - start
+
+    status = "halted" if machine.halted else "step limit"
+    print(f"{steps} instructions in {elapsed:.3f} s ({steps / elapsed / 1e6:.2f} M instr/s, {status})")
+    for address in parse_addresses(args.ram):
+        print(f"RAM[{address}] = {machine.peek(address, signed=True)}")
+    if args.screen:
+        machine.write_screen_pbm(args.screen)
+        print(f"Screen saved to: {args.screen}")
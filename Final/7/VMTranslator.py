@@ -1,21 +1,44 @@
 import sys
 import os
+import argparse
 
 class VMTranslator:
-    def __init__(self, input_file):
+    def __init__(self, input_file, shared_compare=False, output_file=None):
         self.input_file = input_file
         # Nama file tanpa ekstensi untuk static variable (misal: "StaticTest")
-        self.filename = os.path.basename(input_file).replace('.vm', '')
+        # Input '-' (stdin) gak punya nama file, static jadi "stdin.i"
+        self.filename = "stdin" if input_file == '-' else os.path.splitext(os.path.basename(input_file))[0]
+        if output_file is None:
+            output_file = '-' if input_file == '-' else os.path.splitext(input_file)[0] + '.asm'
+        self.output_file = output_file
         self.label_counter = 0 # Penting buat EQ, GT, LT biar label gak tabrakan
+        # shared_compare: eq/gt/lt lompat ke routine $EQ/$GT/$LT bersama
+        # (cukup 1 label per site) daripada inline 13 instruksi + 2 label
+        self.shared_compare = shared_compare
 
     def translate(self):
-        output_file = self.input_file.replace('.vm', '.asm')
-        
-        with open(self.input_file, 'r') as f:
-            lines = f.readlines()
+        # Input/output '-' = stdin/stdout, biar bisa disambung pake pipe
+        if self.input_file == '-':
+            self.write_output(self.translate_lines(sys.stdin))
+        else:
+            with open(self.input_file, 'r') as f:
+                self.write_output(self.translate_lines(f))
 
-        asm_code = []
+    def write_output(self, asm_code):
+        if self.output_file == '-':
+            for line in asm_code:
+                sys.stdout.write(line + '\n')
+            log = sys.stderr
+        else:
+            with open(self.output_file, 'w') as f:
+                for line in asm_code:
+                    f.write(line + '\n')
+            log = sys.stdout
         
+        print(f"Generated: {self.output_file}", file=log)
+
+    def translate_lines(self, lines):
+        """Generator: takes VM lines, yields Hack assembly lines one by one."""
         for line in lines:
             line = self.clean_line(line)
             if not line: continue
@@ -23,25 +46,26 @@ class VMTranslator:
             parts = line.split()
             command = parts[0]
             
-            asm_code.append(f"// {line}") # Debugging comments di output
+            yield f"// {line}" # Debugging comments di output
             
             if command == 'push':
                 segment = parts[1]
                 index = int(parts[2])
-                asm_code.extend(self.write_push(segment, index))
+                yield from self.write_push(segment, index)
             
             elif command == 'pop':
                 segment = parts[1]
                 index = int(parts[2])
-                asm_code.extend(self.write_pop(segment, index))
+                yield from self.write_pop(segment, index)
                 
             elif command in ['add', 'sub', 'neg', 'eq', 'gt', 'lt', 'and', 'or', 'not']:
-                asm_code.extend(self.write_arithmetic(command))
+                yield from self.write_arithmetic(command)
 
-        with open(output_file, 'w') as f:
-            f.write('\n'.join(asm_code) + '\n')
-        
-        print(f"Generated: {output_file}")
+        # Routine bersama ditaruh di akhir, dijaga loop biar gak
+        # ke-eksekusi kalo program jalan sampe habis
+        if self.shared_compare and self.label_counter > 0:
+            yield from ["($HALT)", "@$HALT", "0;JMP"]
+            yield from self.write_compare_routines()
 
     def clean_line(self, line):
         return line.split('//')[0].strip()
@@ -99,6 +123,9 @@ class VMTranslator:
             ]
             
         elif command in ['eq', 'gt', 'lt']:
+            if self.shared_compare:
+                return self.write_compare_shared(command)
+
             # Logic Comparison: x - y, lalu cek hasil pake Jump
             label_true = f"TRUE_{self.label_counter}"
             label_end = f"END_{self.label_counter}"
@@ -143,6 +170,47 @@ class VMTranslator:
 
         return code
 
+    # --- SHARED COMPARISON ---
+
+    def write_compare_shared(self, command):
+        # Simpan return-address di R15, lompat ke routine $EQ/$GT/$LT
+        label_return = f"$RET_CMP.{self.label_counter}"
+        self.label_counter += 1
+        return [
+            f"@{label_return}",
+            "D=A",
+            "@R15",
+            "M=D",
+            f"@${command.upper()}",
+            "0;JMP",
+            f"({label_return})"
+        ]
+
+    def write_compare_routines(self):
+        code = []
+        for command in ['eq', 'gt', 'lt']:
+            jump_type = {'eq': 'JEQ', 'gt': 'JGT', 'lt': 'JLT'}[command]
+            code.append(f"(${command.upper()})")
+            code.extend(self.pop_stack_to_D_and_M())
+            code.extend([
+                "D=M-D",          # D = x - y
+                "M=-1",           # Anggap True dulu (A masih nunjuk ke x)
+                "@$CMP_END",
+                f"D;{jump_type}", # Kondisi terpenuhi, langsung balik
+                "@SP",
+                "A=M-1",
+                "M=0"             # False = 0
+            ])
+            if command != 'lt': # $LT paling bawah, langsung jatuh ke $CMP_END
+                code.extend(["@$CMP_END", "0;JMP"])
+        code.extend([
+            "($CMP_END)",
+            "@R15",
+            "A=M",
+            "0;JMP"               # Balik ke call site
+        ])
+        return code
+
     def write_push(self, segment, index):
         code = []
         if segment == 'constant':
@@ -230,9 +298,18 @@ class VMTranslator:
         return code
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python VMTranslator.py <file.vm>")
-    else:
-        translator = VMTranslator(sys.argv[1])
+    parser = argparse.ArgumentParser(description="VM to Hack assembly translator (stack arithmetic & memory access)")
+    parser.add_argument("input", help="file.vm OR '-' for stdin")
+    parser.add_argument("-o", "--output", help="output .asm ('-' for stdout, default for stdin input)")
+    parser.add_argument("--shared-compare", action="store_true",
+                        help="emit shared $EQ/$GT/$LT routines instead of inlining every comparison")
+    args = parser.parse_args()
+
+    translator = VMTranslator(args.input, shared_compare=args.shared_compare, output_file=args.output)
+    try:
         translator.translate()
+    except BrokenPipeError:
+        # Pembaca pipe berhenti duluan (misal `| head`), gak usah traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     
\ No newline at end of file
@@ -0,0 +1,317 @@
+import sys
+import os
+import json
+import time
+import argparse
+
+from VMTranslator2 import parse_lines
+
+# Parser argumen --set/--ram (Final/common) dipake bareng sama emulator di Final/6
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from ram_args import parse_assignments, parse_addresses
+
+# Interpreter VM langsung (tanpa translate -> assemble -> emulate).
+# Layout RAM sama persis kayak hasil VMTranslator2: SP/LCL/ARG/THIS/THAT
+# di RAM[0..4], temp di 5..12, static mulai 16, stack mulai 256, screen
+# di 16384. Jadi OS Jack (Memory.peek, Screen, dll) jalan apa adanya.
+
+RAM_SIZE = 32768
+SP, LCL, ARG, THIS, THAT = 0, 1, 2, 3, 4
+
+# --- 1. OPCODES ---
+# Tiap command di-resolve sekali jadi tuple (op, a, b): segment jadi
+# alamat pointer / alamat absolut, label jadi index, fungsi jadi object.
+
+(PUSH_CONST, PUSH_PTR, PUSH_ADDR, POP_PTR, POP_ADDR,
+ ADD, SUB, NEG, EQ, GT, LT, AND, OR, NOT,
+ GOTO, IF_GOTO, CALL, RETURN) = range(18)
+
+ARITHMETIC = {'add': ADD, 'sub': SUB, 'neg': NEG, 'eq': EQ, 'gt': GT,
+              'lt': LT, 'and': AND, 'or': OR, 'not': NOT}
+POINTERS = {'local': LCL, 'argument': ARG, 'this': THIS, 'that': THAT}
+
+class VMError(Exception):
+    pass
+
+class Function:
+    __slots__ = ('name', 'num_locals', 'code', 'calls', 'instructions')
+
+    def __init__(self, name, num_locals):
+        self.name = name
+        self.num_locals = num_locals
+        self.code = []
+        # Profiling
+        self.calls = 0
+        self.instructions = 0
+
+# --- 2. LOADER ---
+
+def read_sources(path):
+    # File .vm atau directory (urutan sorted, sama kayak VMTranslator2)
+    if os.path.isdir(path):
+        files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.vm')]
+    else:
+        files = [path]
+    sources = []
+    for vm_file in files:
+        with open(vm_file, 'r') as f:
+            sources.append((os.path.splitext(os.path.basename(vm_file))[0], list(parse_lines(f))))
+    return sources
+
+class Program:
+    def __init__(self, sources):
+        self.functions = {}
+        self.statics = {}
+        # Command di luar fungsi (BasicLoop, dll) masuk pseudo-function per file
+        self.toplevel = []
+
+        pending = [] # (function, labels, jumps) buat resolve label belakangan
+        for filename, commands in sources:
+            function = Function(f"<{filename}>", 0)
+            self.toplevel.append(function)
+            labels, jumps = {}, []
+            for parts in commands:
+                command = parts[0]
+                if command == 'function':
+                    pending.append((function, labels, jumps))
+                    function = Function(parts[1], int(parts[2]))
+                    if function.name in self.functions:
+                        raise VMError(f"duplicate function {function.name}")
+                    self.functions[function.name] = function
+                    labels, jumps = {}, []
+                elif command == 'label':
+                    labels[parts[1]] = len(function.code)
+                elif command in ['goto', 'if-goto']:
+                    jumps.append((len(function.code), parts[1]))
+                    function.code.append((GOTO if command == 'goto' else IF_GOTO, parts[1], None))
+                else:
+                    function.code.append(self.resolve(filename, parts))
+            pending.append((function, labels, jumps))
+
+        for function, labels, jumps in pending:
+            for index, label in jumps:
+                if label not in labels:
+                    raise VMError(f"{function.name}: unknown label {label}")
+                op = function.code[index][0]
+                function.code[index] = (op, labels[label], None)
+            for index, (op, target, num_args) in enumerate(function.code):
+                if op == CALL:
+                    if target not in self.functions:
+                        raise VMError(f"{function.name}: call to unknown function {target}")
+                    function.code[index] = (CALL, self.functions[target], num_args)
+
+    def resolve(self, filename, parts):
+        command = parts[0]
+        if command in ARITHMETIC:
+            return (ARITHMETIC[command], None, None)
+        if command == 'return':
+            return (RETURN, None, None)
+        if command == 'call':
+            return (CALL, parts[1], int(parts[2]))
+        if command in ['push', 'pop']:
+            segment, index = parts[1], int(parts[2])
+            if segment == 'constant' and command == 'push':
+                return (PUSH_CONST, index, None)
+            if segment in POINTERS:
+                return (PUSH_PTR if command == 'push' else POP_PTR, POINTERS[segment], index)
+            if segment == 'temp': address = 5 + index
+            elif segment == 'pointer': address = 3 + index
+            elif segment == 'static':
+                # Alamat static dialokasi mulai 16, urut kemunculan (kayak assembler)
+                address = self.statics.setdefault(f"{filename}.{index}", 16 + len(self.statics))
+            else:
+                raise VMError(f"unknown segment in: {' '.join(parts)}")
+            return (PUSH_ADDR if command == 'push' else POP_ADDR, address, None)
+        raise VMError(f"unknown command: {' '.join(parts)}")
+
+# --- 3. MACHINE ---
+
+class VMMachine:
+    def __init__(self, program):
+        self.program = program
+        self.ram = [0] * RAM_SIZE
+        self.steps = 0
+        self.halted = False
+
+    def poke(self, address, value):
+        self.ram[address] = value & 0xFFFF
+
+    def peek(self, address, signed=False):
+        value = self.ram[address]
+        if signed and value & 0x8000:
+            value -= 0x10000
+        return value
+
+    def run(self, max_steps, entry=None):
+        """
+        Runs from Sys.init (with the standard bootstrap) if it exists,
+        otherwise from the top-level code of the first file. Stops at
+        Sys.halt, when the code runs off its end, or after max_steps.
+        Returns the number of VM commands executed.
+        """
+        program = self.program
+        ram = self.ram
+        functions = program.functions
+
+        if entry is None and "Sys.init" in functions:
+            # Bootstrap: SP = 256, 'call Sys.init 0'
+            ram[SP] = 256 + 5
+            ram[LCL] = ram[SP]
+            ram[ARG] = 256
+            entry = "Sys.init"
+        if entry is not None:
+            function = functions[entry]
+        else:
+            # Tanpa Sys.init (test project 7/8): mulai dari kode top-level
+            # file pertama, atau fungsi pertama dengan frame yang udah diset
+            # dari luar (--set), kayak SimpleFunction.tst
+            toplevel = [f for f in program.toplevel if f.code]
+            function = toplevel[0] if toplevel else next(iter(functions.values()))
+        function.calls += 1
+        for _ in range(function.num_locals):
+            ram[ram[SP]] = 0
+            ram[SP] += 1
+
+        halt = functions.get("Sys.halt")
+        frames = [] # (function, pc) caller, buat return
+        code = function.code
+        size = len(code)
+        pc = 0
+        steps = 0
+        entered = 0 # steps waktu function sekarang mulai/lanjut jalan
+
+        while steps < max_steps:
+            if pc >= size:
+                self.halted = True
+                break
+            op, a, b = code[pc]
+            pc += 1
+            steps += 1
+
+            if op == PUSH_CONST:
+                sp = ram[SP]; ram[sp] = a; ram[SP] = sp + 1
+            elif op == PUSH_PTR:
+                sp = ram[SP]; ram[sp] = ram[(ram[a] + b) & 0x7FFF]; ram[SP] = sp + 1
+            elif op == PUSH_ADDR:
+                sp = ram[SP]; ram[sp] = ram[a]; ram[SP] = sp + 1
+            elif op == POP_PTR:
+                sp = ram[SP] - 1; ram[SP] = sp; ram[(ram[a] + b) & 0x7FFF] = ram[sp]
+            elif op == POP_ADDR:
+                sp = ram[SP] - 1; ram[SP] = sp; ram[a] = ram[sp]
+            elif op <= OR:
+                # Aritmetika 16-bit, semantik sama kayak kode Hack hasil translator
+                sp = ram[SP] - 1
+                if op == NEG: ram[sp] = -ram[sp] & 0xFFFF; continue
+                y = ram[sp]; x = ram[sp - 1]; ram[SP] = sp
+                if op == ADD: ram[sp - 1] = (x + y) & 0xFFFF
+                elif op == SUB: ram[sp - 1] = (x - y) & 0xFFFF
+                elif op == AND: ram[sp - 1] = x & y
+                elif op == OR: ram[sp - 1] = x | y
+                else:
+                    d = (x - y) & 0xFFFF
+                    if op == EQ: ram[sp - 1] = 0xFFFF if d == 0 else 0
+                    elif op == GT: ram[sp - 1] = 0xFFFF if 0 < d < 0x8000 else 0
+                    else: ram[sp - 1] = 0xFFFF if d & 0x8000 else 0
+            elif op == NOT:
+                sp = ram[SP] - 1; ram[sp] ^= 0xFFFF
+            elif op == GOTO:
+                pc = a
+            elif op == IF_GOTO:
+                sp = ram[SP] - 1; ram[SP] = sp
+                if ram[sp]: pc = a
+            elif op == CALL:
+                if a is halt:
+                    self.halted = True
+                    break
+                # Frame sama kayak Hack: return-address (di sini cuma
+                # penanda kedalaman), LCL, ARG, THIS, THAT
+                function.instructions += steps - entered
+                frames.append((function, pc))
+                sp = ram[SP]
+                ram[sp] = len(frames)
+                ram[sp + 1] = ram[LCL]; ram[sp + 2] = ram[ARG]
+                ram[sp + 3] = ram[THIS]; ram[sp + 4] = ram[THAT]
+                sp += 5
+                ram[ARG] = sp - 5 - b
+                ram[LCL] = sp
+                for _ in range(a.num_locals):
+                    ram[sp] = 0
+                    sp += 1
+                ram[SP] = sp
+                function = a
+                function.calls += 1
+                code = function.code; size = len(code); pc = 0
+                entered = steps
+            else: # RETURN
+                frame = ram[LCL]
+                arg = ram[ARG]
+                ram[arg] = ram[ram[SP] - 1]
+                ram[SP] = arg + 1
+                ram[THAT] = ram[frame - 1]; ram[THIS] = ram[frame - 2]
+                ram[ARG] = ram[frame - 3]; ram[LCL] = ram[frame - 4]
+                function.instructions += steps - entered
+                if not frames:
+                    # Return dari entry function: program selesai
+                    self.halted = True
+                    entered = steps
+                    break
+                function, pc = frames.pop()
+                code = function.code; size = len(code)
+                entered = steps
+
+        function.instructions += steps - entered
+        self.steps += steps
+        return steps
+
+    def profile(self):
+        """Returns (name, calls, instructions) for every function that ran, hottest first."""
+        functions = list(self.program.functions.values()) + self.program.toplevel
+        rows = [(f.name, f.calls, f.instructions) for f in functions if f.calls or f.instructions]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+# --- 4. CLI ---
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VM interpreter with per-function profiling")
+    parser.add_argument("input", help="input_file.vm OR input_directory")
+    parser.add_argument("--steps", type=int, default=10_000_000, help="max VM commands to execute")
+    parser.add_argument("--set", default="", help="initial RAM values, e.g. 0=256,1=300")
+    parser.add_argument("--ram", default="", help="RAM addresses to print afterwards, e.g. 0-2,256")
+    parser.add_argument("--top", type=int, default=20, help="number of functions in the profile")
+    parser.add_argument("--profile-json", help="write the full profile as JSON")
+    args = parser.parse_args()
+
+    try:
+        program = Program(read_sources(args.input))
+    except VMError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    machine = VMMachine(program)
+    for address, value in parse_assignments(args.set):
+        machine.poke(address, value)
+
+    start = time.perf_counter()
+    steps = machine.run(args.steps)
+    elapsed = time.perf_counter() - start
+
+    status = "halted" if machine.halted else "step limit"
+    print(f"{steps} VM commands in {elapsed:.3f} s ({steps / elapsed / 1e6:.2f} M cmd/s, {status})")
+    for address in parse_addresses(args.ram):
+        print(f"RAM[{address}] = {machine.peek(address, signed=True)}")
+
+    rows = machine.profile()
+    print(f"\n{'function':<32} {'calls':>10} {'commands':>12} {'%':>6}")
+    for name, calls, instructions in rows[:args.top]:
+        print(f"{name:<32} {calls:>10} {instructions:>12} {instructions / max(steps, 1):>6.1%}")
+
+    if args.profile_json:
+        with open(args.profile_json, 'w') as f:
+            json.dump({
+                "steps": steps,
+                "seconds": elapsed,
+                "halted": machine.halted,
+                "functions": [{"name": name, "calls": calls, "instructions": instructions}
+                              for name, calls, instructions in rows],
+            }, f, indent=2)
+        print(f"Profile saved to: {args.profile_json}")
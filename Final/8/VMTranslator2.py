@@ -1,81 +1,513 @@
 import sys
 import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Cache LRU di disk dipake bareng sama token cache Jack (Final/11)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'common'))
+from disk_cache import DiskCache
+
+ROM_SIZE = 32768
+
+# Counter yang dijumlahin dari tiap worker (mode paralel)
+STAT_FIELDS = ['rom_size', 'inline_rom_size', 'call_count', 'return_count', 'compare_count']
+# Tabel biaya ROM: key -> [jumlah command VM, jumlah instruksi Hack]
+COST_TABLES = ['cost_by_command', 'cost_by_function', 'cost_by_file']
+
+def instruction_count(code):
+    # Label (XXX) dan comment // gak makan tempat di ROM
+    return sum(1 for line in code if not line.startswith(('(', '//')))
+
+# --- FUSION RULES ---
+# Dicek ke ekor buffer command (urutan penting: fold dulu baru fuse).
+# Tiap rule: (nama, panjang window, match(window) -> command baru / None)
+
+FUSED_COMMANDS = ['$add-constant', '$move', '$if-not-goto']
+
+def to_signed(value):
+    # Aritmetika Hack 16-bit (wrap around)
+    return (value + 32768) % 65536 - 32768
+
+def constant_of(parts):
+    if parts[0] == 'push' and parts[1] == 'constant':
+        return int(parts[2])
+    return None
+
+def fold_binary(window):
+    a, b = constant_of(window[0]), constant_of(window[1])
+    if a is None or b is None: return None
+    op = window[2][0]
+    if op == 'add': value = to_signed(a + b)
+    elif op == 'sub': value = to_signed(a - b)
+    elif op == 'and': value = to_signed(a & b)
+    elif op == 'or': value = to_signed(a | b)
+    elif op in ['eq', 'gt', 'lt']:
+        # Sama kayak hardware: cek tanda dari x - y (yang bisa overflow)
+        diff = to_signed(a - b)
+        result = {'eq': diff == 0, 'gt': diff > 0, 'lt': diff < 0}[op]
+        value = -1 if result else 0
+    else: return None
+    return ['push', 'constant', str(value)]
+
+def fold_unary(window):
+    a = constant_of(window[0])
+    if a is None: return None
+    op = window[1][0]
+    if op == 'neg': return ['push', 'constant', str(to_signed(-a))]
+    if op == 'not': return ['push', 'constant', str(to_signed(~a))]
+    return None
+
+def fuse_add_constant(window):
+    n = constant_of(window[0])
+    if n is None or window[1][0] not in ['add', 'sub']: return None
+    return ['$add-constant', str(to_signed(n if window[1][0] == 'add' else -n))]
+
+def fuse_move(window):
+    if window[0][0] != 'push' or window[1][0] != 'pop': return None
+    return ['$move'] + window[0][1:] + window[1][1:]
+
+def fuse_if_not(window):
+    if window[0][0] != 'not' or window[1][0] != 'if-goto': return None
+    return ['$if-not-goto', window[1][1]]
+
+FUSION_RULES = [
+    ("fold_binary", 3, fold_binary),
+    ("fold_unary", 2, fold_unary),
+    ("add_constant", 2, fuse_add_constant),
+    ("move", 2, fuse_move),
+    ("if_not", 2, fuse_if_not),
+]
+
+# Buffer fusion dibatesin biar memory tetep kecil di mode streaming
+FUSE_WINDOW = 16
+
+def parse_lines(lines):
+    # Baris VM -> list token, komentar & baris kosong dibuang
+    for line in lines:
+        line = line.split('//')[0].strip()
+        if line:
+            yield line.split()
+
+# --- TRANSLATION CACHE ---
+# Hasil translate per file disimpen di cache directory, key-nya hash dari
+# command VM (setelah komentar dibuang + prune), nama file, opsi, dan
+# source translator ini sendiri (ganti kode = cache lama otomatis basi).
+
+with open(__file__, 'rb') as _self_source:
+    TRANSLATOR_VERSION = hashlib.sha256(_self_source.read()).hexdigest()
+
+class TranslationCache(DiskCache):
+    suffix = ".json"
+
+    def key(self, filename, commands, options):
+        h = hashlib.sha256()
+        h.update(TRANSLATOR_VERSION.encode())
+        h.update(json.dumps(options, sort_keys=True).encode())
+        h.update(filename.encode() + b'\0')
+        for parts in commands:
+            h.update(' '.join(parts).encode() + b'\n')
+        return h.hexdigest()
+
+    # Entry = (fragment assembly, statistik) hasil translate_job
+    def encode(self, value):
+        fragment, stats = value
+        return json.dumps({"fragment": fragment, "stats": stats}).encode()
+
+    def decode(self, data):
+        entry = json.loads(data)
+        return entry["fragment"], entry["stats"]
 
 class VMTranslator:
-    def __init__(self, input_path):
+    def __init__(self, input_path, shared_calls=False, shared_compare=False, cache_tos=False,
+                 fuse_commands=False, prune_functions=False, jobs=1, cache=None,
+                 output_file=None, bootstrap=False, report_file=None):
         self.input_path = input_path
         self.label_counter = 0
         self.ret_counter = 0
         self.lines = []
+        # bootstrap: paksa bootstrap buat input stdin (gak ada Sys.vm buat dicek)
+        self.bootstrap = bootstrap
+        # report_file: laporan biaya ROM (JSON) per command/fungsi/file
+        self.report_file = report_file
+        self.log = sys.stdout
+
+        # shared_calls: call/return lompat ke routine $CALL/$RETURN bersama
+        # (sekali di bootstrap) daripada inline ~50 instruksi per call site
+        self.shared_calls = shared_calls
+        # shared_compare: eq/gt/lt lompat ke routine $EQ/$GT/$LT bersama
+        self.shared_compare = shared_compare
+        # cache_tos: top of stack boleh "nginep" di D antar command
+        # straight-line, baru di-spill ke RAM pas label/goto/call/return
+        self.cache_tos = cache_tos
+        self.tos_in_D = False
+        # fuse_commands: window VM command digabung / constant di-fold
+        # sebelum jadi Hack (lihat FUSION RULES)
+        self.fuse_commands = fuse_commands
+        self.fused = {}
+        # prune_functions: fungsi yang gak kejangkau dari Sys.init dibuang
+        self.prune_functions = prune_functions
+        self.removed_functions = 0
+        self.removed_commands = 0
+        # jobs > 1: file-file di-translate paralel di process pool
+        self.jobs = jobs
+        # cache: TranslationCache (opsional), hasil per file dipake ulang
+        self.cache = cache
+        # Opsi code generation, dioper ke worker process
+        self.options = dict(shared_calls=shared_calls, shared_compare=shared_compare,
+                            cache_tos=cache_tos, fuse_commands=fuse_commands)
+        self.call_count = 0
+        self.return_count = 0
+        self.compare_count = 0
+        self.rom_size = 0
+        self.inline_rom_size = 0 # ukuran kalo semuanya di-inline
         
-        # Determine output filename
-        if os.path.isdir(input_path):
+        # Determine output filename ('-' = stdin/stdout)
+        if input_path == '-':
+            self.dir_name = "stdin"
+            self.output_file = output_file or '-'
+            self.is_dir = False
+        elif os.path.isdir(input_path):
             self.dir_name = os.path.basename(os.path.normpath(input_path))
-            self.output_file = os.path.join(input_path, f"{self.dir_name}.asm")
+            self.output_file = output_file or os.path.join(input_path, f"{self.dir_name}.asm")
             self.is_dir = True
         else:
-            self.output_file = input_path.replace('.vm', '.asm')
-            self.dir_name = os.path.basename(input_path).replace('.vm', '')
+            self.output_file = output_file or os.path.splitext(input_path)[0] + '.asm'
+            self.dir_name = os.path.splitext(os.path.basename(input_path))[0]
             self.is_dir = False
             
         self.current_filename = "" # For static variables
+        self.current_function = "" # Buat laporan biaya ROM
+        self.cost_by_command = {}
+        self.cost_by_function = {}
+        self.cost_by_file = {}
 
     def translate(self):
+        if self.input_path == '-':
+            lines = self.translate_lines(sys.stdin, bootstrap=self.bootstrap)
+        else:
+            lines = self.translate_files()
+
+        # Kalo output ke stdout, laporan pindah ke stderr biar pipe-nya bersih
+        if self.output_file == '-':
+            self.log = sys.stderr
+            for line in lines:
+                sys.stdout.write(line + '\n')
+        else:
+            with open(self.output_file, 'w') as f:
+                for line in lines:
+                    f.write(line + '\n')
+
+        print(f"Generated: {self.output_file}", file=self.log)
+        self.report_rom_size()
+        if self.report_file:
+            self.write_cost_report(self.report_file)
+            print(f"ROM cost report saved to: {self.report_file}", file=self.log)
+
+    def translate_files(self):
         vm_files = []
         if self.is_dir:
-            # Get all .vm files in directory
-            vm_files = [os.path.join(self.input_path, f) for f in os.listdir(self.input_path) if f.endswith('.vm')]
+            # Get all .vm files in directory. Di-sort biar output-nya
+            # deterministik (urutan os.listdir beda-beda tiap filesystem)
+            vm_files = [os.path.join(self.input_path, f) for f in sorted(os.listdir(self.input_path)) if f.endswith('.vm')]
         else:
             vm_files = [self.input_path]
 
-        with open(self.output_file, 'w') as f:
-            # 1. Write Bootstrap Code
-            # Cuma inject bootstrap kalo ada Sys.vm (indikator Full Program)
-            # SimpleFunction, BasicLoop, dll GAK BOLEH pake bootstrap.
-            if 'Sys.vm' in [os.path.basename(vf) for vf in vm_files]:
-                f.write("// Bootstrap Code\n")
-                f.write("@256\nD=A\n@SP\nM=D\n") # SP = 256
-                # Call Sys.init
-                f.write("\n".join(self.write_call("Sys.init", 0)) + "\n")
-
-            # 2. Process each file
-            for vm_file in vm_files:
-                self.current_filename = os.path.basename(vm_file).replace('.vm', '')
-                f.write(f"// --- Processing {self.current_filename} ---\n")
-                
-                with open(vm_file, 'r') as vf:
-                    for line in vf:
-                        line = line.split('//')[0].strip()
-                        if not line: continue
-                        
-                        f.write(f"// {line}\n")
-                        parts = line.split()
-                        command = parts[0]
-                        
-                        code = []
-                        if command == 'push':
-                            code = self.write_push(parts[1], int(parts[2]))
-                        elif command == 'pop':
-                            code = self.write_pop(parts[1], int(parts[2]))
-                        elif command in ['add', 'sub', 'neg', 'eq', 'gt', 'lt', 'and', 'or', 'not']:
-                            code = self.write_arithmetic(command)
-                        elif command == 'label':
-                            code = [f"({parts[1]})"]
-                        elif command == 'goto':
-                            code = [f"@{parts[1]}", "0;JMP"]
-                        elif command == 'if-goto':
-                            # Pop logic: value != 0 means True
-                            code = self.pop_stack_to_D() + [f"@{parts[1]}", "D;JNE"]
-                        elif command == 'function':
-                            code = self.write_function(parts[1], int(parts[2]))
-                        elif command == 'return':
-                            code = self.write_return()
-                        elif command == 'call':
-                            code = self.write_call(parts[1], int(parts[2]))
-                            
-                        f.write('\n'.join(code) + '\n')
-                        
-        print(f"Generated: {self.output_file}")
+        has_bootstrap = 'Sys.vm' in [os.path.basename(vf) for vf in vm_files]
+
+        sources = [(os.path.splitext(os.path.basename(vf))[0], self.read_commands(vf)) for vf in vm_files]
+        # Tanpa bootstrap gak ada entry point (Sys.init), semua fungsi dianggap hidup
+        if self.prune_functions and has_bootstrap:
+            sources = self.prune(sources)
+
+        # 1. Write Bootstrap Code
+        # Cuma inject bootstrap kalo ada Sys.vm (indikator Full Program)
+        # SimpleFunction, BasicLoop, dll GAK BOLEH pake bootstrap.
+        if has_bootstrap:
+            yield from self.write_bootstrap()
+
+        # 2. Process each file (urutan sama kayak sources, paralel atau nggak)
+        yield from self.translate_sources(sources)
+
+        if not has_bootstrap:
+            yield from self.write_epilogue()
+
+    def translate_lines(self, lines, filename=None, bootstrap=False):
+        """
+        Streaming core: takes an iterable of VM lines and yields Hack assembly
+        lines one by one. Without a filename (e.g. stdin), statics and
+        generated labels are named after the class of the current function.
+        """
+        if bootstrap:
+            yield from self.write_bootstrap()
+        yield from self.translate_commands(filename, parse_lines(lines))
+        if not bootstrap:
+            yield from self.write_epilogue()
+
+    def write_bootstrap(self):
+        self.current_filename = "$BOOT"
+        self.current_function = "$bootstrap"
+        code = ["@256", "D=A", "@SP", "M=D"] # SP = 256
+        self.count("bootstrap", [], code)
+        yield "// Bootstrap Code"
+        yield from code
+        # Call Sys.init
+        code = self.write_call("Sys.init", 0)
+        self.count("call", ["call", "Sys.init", "0"], code)
+        yield from code
+
+        # Sys.init gak pernah return, jadi routine bersama aman ditaruh di sini
+        if self.shared_calls or self.shared_compare:
+            yield from self.write_shared_routines()
+
+    def write_epilogue(self):
+        # Tanpa bootstrap eksekusi mulai dari ROM[0], routine bersama
+        # ditaruh di paling akhir, dijaga loop biar gak ke-eksekusi
+        # kalo program jalan sampe habis
+        if self.uses_shared_routines():
+            self.current_filename = "$BOOT"
+            self.current_function = "$halt"
+            code = ["($HALT)", "@$HALT", "0;JMP"]
+            self.count("halt", [], code)
+            yield from code + self.write_shared_routines()
+
+    # --- PER-FILE TRANSLATION ---
+    # Semua label bikinan translator di-prefix nama file dan counter-nya
+    # reset per file, jadi tiap file bisa ditranslate sendiri-sendiri
+    # (di process lain) terus hasilnya tinggal disambung.
+
+    def translate_sources(self, sources):
+        # Tiap file ditranslate translator baru (translate_job), jadi hasilnya
+        # sama persis mau dari cache, process pool, atau process ini sendiri
+        results = [None] * len(sources)
+        keys = [None] * len(sources)
+        pending = []
+        for i, (filename, commands) in enumerate(sources):
+            if self.cache is not None:
+                keys[i] = self.cache.key(filename, commands, self.options)
+                results[i] = self.cache.get(keys[i])
+            if results[i] is None:
+                pending.append(i)
+
+        if self.jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                futures = {i: pool.submit(translate_job, self.input_path, self.options, *sources[i])
+                           for i in pending}
+                for i, future in futures.items():
+                    results[i] = future.result()
+        else:
+            for i in pending:
+                results[i] = translate_job(self.input_path, self.options, *sources[i])
+
+        if self.cache is not None:
+            for i in pending:
+                self.cache.put(keys[i], results[i])
+            self.cache.evict()
+
+        for fragment, stats in results:
+            self.merge_stats(stats)
+            yield fragment
+
+    def translate_source(self, filename, commands):
+        return '\n'.join(self.translate_commands(filename, commands))
+
+    def translate_commands(self, filename, commands):
+        # filename None: nama class diambil dari 'function Class.name'
+        self.current_filename = filename or self.dir_name
+        self.current_function = f"<{self.current_filename}>"
+        self.label_counter = 0
+        self.ret_counter = 0
+        yield f"// --- Processing {self.current_filename} ---"
+
+        commands = self.scope_labels(commands)
+        if self.fuse_commands:
+            commands = self.fuse(commands)
+
+        for parts in commands:
+            command = parts[0]
+            if command == 'function':
+                self.current_function = parts[1]
+                if filename is None:
+                    self.current_filename = parts[1].split('.')[0]
+            code = self.write_command(command, parts)
+            self.count(command, parts, code)
+            yield f"// {' '.join(parts)}"
+            yield from code
+
+        # Akhir file: stack di RAM harus lengkap lagi
+        code = self.spill()
+        if code:
+            self.count("spill", [], code)
+        yield from code
+
+    def scope_labels(self, commands):
+        # label/goto/if-goto dalam fungsi f jadi f$label (spec VM),
+        # di luar fungsi pake nama file
+        scope = self.current_filename
+        for parts in commands:
+            if parts[0] == 'function':
+                scope = parts[1]
+            elif parts[0] in ['label', 'goto', 'if-goto']:
+                parts = [parts[0], f"{scope}${parts[1]}"]
+            yield parts
+
+    def stats(self):
+        stats = {name: getattr(self, name) for name in STAT_FIELDS}
+        stats['fused'] = self.fused
+        for name in COST_TABLES:
+            stats[name] = getattr(self, name)
+        return stats
+
+    def merge_stats(self, stats):
+        for name in STAT_FIELDS:
+            setattr(self, name, getattr(self, name) + stats[name])
+        for name, count in stats['fused'].items():
+            self.fused[name] = self.fused.get(name, 0) + count
+        for name in COST_TABLES:
+            table = getattr(self, name)
+            for key, (commands, instructions) in stats[name].items():
+                entry = table.setdefault(key, [0, 0])
+                entry[0] += commands
+                entry[1] += instructions
+
+    def read_commands(self, vm_file):
+        with open(vm_file, 'r') as vf:
+            return list(parse_lines(vf))
+
+    # --- DEAD FUNCTION ELIMINATION ---
+
+    def prune(self, sources):
+        # Potong tiap file per fungsi, bikin call graph, terus BFS dari
+        # Sys.init. Fungsi yang gak kejangkau gak usah di-emit.
+        functions = {} # nama -> list command (termasuk 'function' sendiri)
+        for filename, commands in sources:
+            current = None
+            for parts in commands:
+                if parts[0] == 'function':
+                    current = parts[1]
+                    functions[current] = []
+                if current is not None:
+                    functions[current].append(parts)
+
+        calls = {name: {parts[1] for parts in body if parts[0] == 'call'}
+                 for name, body in functions.items()}
+        reachable = {"Sys.init"}
+        queue = ["Sys.init"]
+        while queue:
+            for callee in calls.get(queue.pop(), ()):
+                if callee not in reachable:
+                    reachable.add(callee)
+                    queue.append(callee)
+
+        pruned = []
+        for filename, commands in sources:
+            kept = []
+            keep = True # command sebelum 'function' pertama tetep di-emit
+            for parts in commands:
+                if parts[0] == 'function':
+                    keep = parts[1] in reachable
+                    if not keep:
+                        self.removed_functions += 1
+                if keep:
+                    kept.append(parts)
+                else:
+                    self.removed_commands += 1
+            pruned.append((filename, kept))
+        return pruned
+
+    def write_command(self, command, parts):
+        if self.cache_tos:
+            return self.write_cached(command, parts)
+        if command == 'push':
+            return self.write_push(parts[1], int(parts[2]))
+        if command == 'pop':
+            return self.write_pop(parts[1], int(parts[2]))
+        if command in ['add', 'sub', 'neg', 'eq', 'gt', 'lt', 'and', 'or', 'not']:
+            return self.write_arithmetic(command)
+        if command == 'label':
+            return [f"({parts[1]})"]
+        if command == 'goto':
+            return [f"@{parts[1]}", "0;JMP"]
+        if command == 'if-goto':
+            # Pop logic: value != 0 means True
+            return self.pop_stack_to_D() + [f"@{parts[1]}", "D;JNE"]
+        if command == 'function':
+            return self.write_function(parts[1], int(parts[2]))
+        if command == 'return':
+            return self.write_return()
+        if command == 'call':
+            return self.write_call(parts[1], int(parts[2]))
+        if command in FUSED_COMMANDS:
+            return self.write_fused(command, parts)
+        return []
+
+    # --- ROM SIZE ---
+    def count(self, command, parts, code):
+        size = instruction_count(code)
+        self.rom_size += size
+        self.add_cost(command, size)
+        if command in ['runtime', 'halt']:
+            return # cuma ada kalo pake shared routine, gak masuk hitungan inline
+        if self.shared_calls and command == 'call':
+            size = instruction_count(self.write_call_inline(parts[1], int(parts[2]), ""))
+        elif self.shared_calls and command == 'return':
+            size = instruction_count(self.write_return_inline())
+        elif self.shared_compare and command in ['eq', 'gt', 'lt']:
+            size = instruction_count(self.write_compare_inline(command, 0))
+        self.inline_rom_size += size
+
+    def add_cost(self, command, size):
+        for table, key in ((self.cost_by_command, command),
+                           (self.cost_by_function, self.current_function),
+                           (self.cost_by_file, self.current_filename)):
+            entry = table.setdefault(key, [0, 0])
+            entry[0] += 1
+            entry[1] += size
+
+    def write_cost_report(self, filename, top=20):
+        """Writes the ROM cost per VM command type, function and file as JSON."""
+        def rows(table, name):
+            return [{name: key, "vm_commands": commands, "instructions": instructions}
+                    for key, (commands, instructions) in
+                    sorted(table.items(), key=lambda item: item[1][1], reverse=True)]
+
+        functions = rows(self.cost_by_function, "function")
+        report = {
+            "input": self.input_path,
+            "output": self.output_file,
+            "options": self.options,
+            "rom_size": self.rom_size,
+            "by_command": rows(self.cost_by_command, "command"),
+            "by_file": rows(self.cost_by_file, "file"),
+            "by_function": functions,
+            "largest_functions": functions[:top],
+        }
+        with open(filename, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    def uses_shared_routines(self):
+        return ((self.shared_calls and self.call_count + self.return_count > 0) or
+                (self.shared_compare and self.compare_count > 0))
+
+    def report_rom_size(self):
+        print(f"ROM size: {self.rom_size} instructions", file=self.log)
+        if self.shared_calls or self.shared_compare:
+            saved = self.inline_rom_size - self.rom_size
+            print(f"  without shared routines: {self.inline_rom_size} instructions "
+                  f"(saved {saved}, {saved / max(self.inline_rom_size, 1):.1%})", file=self.log)
+        if self.prune_functions:
+            print(f"  removed functions: {self.removed_functions} "
+                  f"({self.removed_commands} VM commands unreachable from Sys.init)", file=self.log)
+        if self.fuse_commands:
+            total = sum(self.fused.values())
+            detail = ", ".join(f"{name} {count}" for name, count in sorted(self.fused.items()))
+            print(f"  fused windows: {total}" + (f" ({detail})" if detail else ""), file=self.log)
+        if self.cache is not None:
+            print(f"  cache: {self.cache.hits} hits, {self.cache.misses} misses, "
+                  f"{self.cache.evicted} evicted ({self.cache.directory})", file=self.log)
+        if self.rom_size > ROM_SIZE:
+            print(f"  WARNING: program does not fit in the {ROM_SIZE}-word ROM", file=self.log)
 
     # --- HELPERS ---
     def pop_stack_to_D(self):
@@ -97,27 +529,41 @@ class VMTranslator:
         if command == 'not': return ["@SP", "A=M-1", "M=!M"]
         
         if command in ['eq', 'gt', 'lt']:
-            lbl_t = f"TRUE_{self.label_counter}"
-            lbl_e = f"END_{self.label_counter}"
+            index = self.label_counter
             self.label_counter += 1
-            jmp = {'eq':'JEQ', 'gt':'JGT', 'lt':'JLT'}[command]
-            return self.pop_stack_to_D_and_M() + [
-                "D=M-D", f"@{lbl_t}", f"D;{jmp}",
-                "@SP", "A=M-1", "M=0", f"@{lbl_e}", "0;JMP",
-                f"({lbl_t})", "@SP", "A=M-1", "M=-1", f"({lbl_e})"
-            ]
+            if self.shared_compare:
+                return self.write_compare_shared(command, index)
+            return self.write_compare_inline(command, index)
         return []
 
+    def write_compare_inline(self, command, index):
+        lbl_t = f"{self.current_filename}$TRUE_{index}"
+        lbl_e = f"{self.current_filename}$END_{index}"
+        jmp = {'eq':'JEQ', 'gt':'JGT', 'lt':'JLT'}[command]
+        return self.pop_stack_to_D_and_M() + [
+            "D=M-D", f"@{lbl_t}", f"D;{jmp}",
+            "@SP", "A=M-1", "M=0", f"@{lbl_e}", "0;JMP",
+            f"({lbl_t})", "@SP", "A=M-1", "M=-1", f"({lbl_e})"
+        ]
+
     def write_push(self, segment, index):
-        if segment == 'constant': return [f"@{index}", "D=A"] + self.push_D_to_stack()
+        code = self.load_to_D(segment, index)
+        return code + self.push_D_to_stack() if code else []
+
+    def load_to_D(self, segment, index):
+        if segment == 'constant':
+            # Constant negatif cuma muncul dari hasil constant folding
+            if index == -1: return ["D=-1"]
+            if index < 0: return [f"@{-index}", "D=-A"]
+            return [f"@{index}", "D=A"]
         
         ptr_map = {'local':'LCL', 'argument':'ARG', 'this':'THIS', 'that':'THAT'}
         if segment in ptr_map:
-            return [f"@{ptr_map[segment]}", "D=M", f"@{index}", "A=D+A", "D=M"] + self.push_D_to_stack()
+            return [f"@{ptr_map[segment]}", "D=M", f"@{index}", "A=D+A", "D=M"]
         
-        if segment == 'temp': return [f"@{5+index}", "D=M"] + self.push_D_to_stack()
-        if segment == 'pointer': return [f"@{3+index}", "D=M"] + self.push_D_to_stack()
-        if segment == 'static': return [f"@{self.current_filename}.{index}", "D=M"] + self.push_D_to_stack()
+        if segment == 'temp': return [f"@{5+index}", "D=M"]
+        if segment == 'pointer': return [f"@{3+index}", "D=M"]
+        if segment == 'static': return [f"@{self.current_filename}.{index}", "D=M"]
         return []
 
     def write_pop(self, segment, index):
@@ -131,6 +577,142 @@ class VMTranslator:
         if segment == 'static': return self.pop_stack_to_D() + [f"@{self.current_filename}.{index}", "M=D"]
         return []
 
+    # --- FUSION ---
+
+    def fuse(self, commands):
+        # Output dipake sebagai buffer: tiap command baru masuk, rule dicek
+        # ke ekor buffer sampe gak ada yang match (fold bisa berantai)
+        out = []
+        for parts in commands:
+            out.append(parts)
+            matched = True
+            while matched:
+                matched = False
+                for name, size, rule in FUSION_RULES:
+                    if len(out) < size: continue
+                    fused = rule(out[-size:])
+                    if fused is None: continue
+                    # -32768 gak bisa dibikin lewat @ (max 32767)
+                    if fused[0] == 'push' and int(fused[2]) == -32768: continue
+                    out[-size:] = [fused]
+                    self.fused[name] = self.fused.get(name, 0) + 1
+                    matched = True
+                    break
+            while len(out) > FUSE_WINDOW:
+                yield out.pop(0)
+        yield from out
+
+    def write_fused(self, command, parts):
+        if command == '$add-constant':
+            n = int(parts[1])
+            if n == 1: return ["@SP", "A=M-1", "M=M+1"]
+            if n == -1: return ["@SP", "A=M-1", "M=M-1"]
+            if n >= 0: return [f"@{n}", "D=A", "@SP", "A=M-1", "M=D+M"]
+            return [f"@{-n}", "D=A", "@SP", "A=M-1", "M=M-D"]
+        if command == '$move':
+            # push X + pop Y: langsung X -> D -> Y, stack gak kesentuh
+            return self.load_to_D(parts[1], int(parts[2])) + self.store_D(parts[3], int(parts[4]))
+        if command == '$if-not-goto':
+            # not + if-goto: lompat kalo !x != 0, alias x != -1
+            return ["@SP", "AM=M-1", "D=M+1", f"@{parts[1]}", "D;JNE"]
+        return []
+
+    # --- TOP-OF-STACK CACHING ---
+    # tos_in_D = True: elemen paling atas stack ada di D (belum ditulis),
+    # SP di RAM nunjuk ke slot-nya. Command yang gak ditangani di sini
+    # spill dulu, terus pake writer biasa.
+
+    def spill(self):
+        if not self.tos_in_D: return []
+        self.tos_in_D = False
+        return self.push_D_to_stack()
+
+    def pop_to_D(self):
+        # Ambil top of stack ke D, dari cache kalo ada
+        if self.tos_in_D:
+            self.tos_in_D = False
+            return []
+        return self.pop_stack_to_D()
+
+    def write_cached(self, command, parts):
+        if command == 'push':
+            segment, index = parts[1], int(parts[2])
+            code = self.spill()
+            if segment == 'constant' and index in (0, 1, -1):
+                code.append(f"D={index}")
+            else:
+                code.extend(self.load_to_D(segment, index))
+            self.tos_in_D = True
+            return code
+
+        if command == 'pop':
+            return self.write_cached_pop(parts[1], int(parts[2]))
+
+        if command in ['add', 'sub', 'and', 'or'] and self.tos_in_D:
+            # D = y, x masih di RAM[SP-1]: hasil langsung ke D
+            op = {'add':'D=D+M', 'sub':'D=M-D', 'and':'D=D&M', 'or':'D=D|M'}[command]
+            return ["@SP", "AM=M-1", op]
+
+        if command in ['neg', 'not'] and self.tos_in_D:
+            return ["D=-D" if command == 'neg' else "D=!D"]
+
+        if command in ['eq', 'gt', 'lt'] and self.tos_in_D and not self.shared_compare:
+            lbl_t = f"{self.current_filename}$TRUE_{self.label_counter}"
+            lbl_e = f"{self.current_filename}$END_{self.label_counter}"
+            self.label_counter += 1
+            jmp = {'eq':'JEQ', 'gt':'JGT', 'lt':'JLT'}[command]
+            return ["@SP", "AM=M-1", "D=M-D", f"@{lbl_t}", f"D;{jmp}",
+                    "D=0", f"@{lbl_e}", "0;JMP", f"({lbl_t})", "D=-1", f"({lbl_e})"]
+
+        if command == 'if-goto':
+            return self.pop_to_D() + [f"@{parts[1]}", "D;JNE"]
+
+        if command == '$add-constant' and self.tos_in_D:
+            n = int(parts[1])
+            if n in (1, -1): return ["D=D+1" if n == 1 else "D=D-1"]
+            return [f"@{n}", "D=D+A"] if n >= 0 else [f"@{-n}", "D=D-A"]
+
+        if command == '$if-not-goto' and self.tos_in_D:
+            self.tos_in_D = False
+            return ["D=D+1", f"@{parts[1]}", "D;JNE"]
+
+        # Sisanya (label, goto, call, return, function, arithmetic tanpa
+        # cache): stack di RAM harus lengkap dulu
+        code = self.spill()
+        if command in ['add', 'sub', 'neg', 'eq', 'gt', 'lt', 'and', 'or', 'not']:
+            code.extend(self.write_arithmetic(command))
+        elif command == 'label':
+            code.append(f"({parts[1]})")
+        elif command == 'goto':
+            code.extend([f"@{parts[1]}", "0;JMP"])
+        elif command == 'function':
+            code.extend(self.write_function(parts[1], int(parts[2])))
+        elif command == 'return':
+            code.extend(self.write_return())
+        elif command == 'call':
+            code.extend(self.write_call(parts[1], int(parts[2])))
+        elif command in FUSED_COMMANDS:
+            code.extend(self.write_fused(command, parts))
+        return code
+
+    def write_cached_pop(self, segment, index):
+        return self.pop_to_D() + self.store_D(segment, index)
+
+    def store_D(self, segment, index):
+        # Tulis D ke segment[index] tanpa ngerusak D sebelum disimpen
+        ptr_map = {'local':'LCL', 'argument':'ARG', 'this':'THIS', 'that':'THAT'}
+        if segment in ptr_map:
+            if index <= 6:
+                # Index kecil: jalan pake A=A+1, D tetep megang value
+                return [f"@{ptr_map[segment]}", "A=M"] + ["A=A+1"] * index + ["M=D"]
+            return ["@R13", "M=D", f"@{ptr_map[segment]}", "D=M", f"@{index}", "D=D+A",
+                    "@R14", "M=D", "@R13", "D=M", "@R14", "A=M", "M=D"]
+
+        if segment == 'temp': return [f"@{5+index}", "M=D"]
+        if segment == 'pointer': return [f"@{3+index}", "M=D"]
+        if segment == 'static': return [f"@{self.current_filename}.{index}", "M=D"]
+        return []
+
     # --- PROJECT 8 SPECIFIC ---
     
     def write_function(self, func_name, num_locals):
@@ -142,9 +724,14 @@ class VMTranslator:
         return code
 
     def write_call(self, func_name, num_args):
-        ret_label = f"{func_name}$ret.{self.ret_counter}"
+        ret_label = f"{self.current_filename}$ret.{self.ret_counter}"
         self.ret_counter += 1
-        
+        self.call_count += 1
+        if self.shared_calls:
+            return self.write_call_shared(func_name, num_args, ret_label)
+        return self.write_call_inline(func_name, num_args, ret_label)
+
+    def write_call_inline(self, func_name, num_args, ret_label):
         # 1. Push return-address
         code = [f"@{ret_label}", "D=A"] + self.push_D_to_stack()
         # 2. Push LCL, ARG, THIS, THAT
@@ -162,6 +749,12 @@ class VMTranslator:
         return code
 
     def write_return(self):
+        self.return_count += 1
+        if self.shared_calls:
+            return ["@$RETURN", "0;JMP"]
+        return self.write_return_inline()
+
+    def write_return_inline(self):
         # FRAME = LCL (saved in R13)
         # RET = *(FRAME-5) (saved in R14)
         code = ["@LCL", "D=M", "@R13", "M=D", # R13 = FRAME
@@ -183,9 +776,108 @@ class VMTranslator:
         code.extend(["@R14", "A=M", "0;JMP"])
         return code
 
+    # --- SHARED CALL/RETURN ---
+
+    def write_call_shared(self, func_name, num_args, ret_label):
+        # Call site cuma set register:
+        # R13 = nArgs + 5, R14 = alamat fungsi, D = return-address
+        return [f"@{num_args + 5}", "D=A", "@R13", "M=D",
+                f"@{func_name}", "D=A", "@R14", "M=D",
+                f"@{ret_label}", "D=A", "@$CALL", "0;JMP",
+                f"({ret_label})"]
+
+    def write_shared_routines(self):
+        code = []
+        if self.shared_calls:
+            code.extend(self.shared_call_routines())
+        if self.shared_compare:
+            code.extend(self.shared_compare_routines())
+        self.current_filename = "$BOOT"
+        self.current_function = "$runtime"
+        self.count("runtime", [], code)
+        return code
+
+    def shared_call_routines(self):
+        # ($CALL): push D (return-address), LCL, ARG, THIS, THAT,
+        # ARG = SP - R13, LCL = SP, goto R14
+        code = ["// Shared call/return routines", "($CALL)"] + self.push_D_to_stack()
+        for seg in ['LCL', 'ARG', 'THIS', 'THAT']:
+            code.extend([f"@{seg}", "D=M"] + self.push_D_to_stack())
+        code.extend(["@R13", "D=M", "@SP", "D=M-D", "@ARG", "M=D"])
+        code.extend(["@SP", "D=M", "@LCL", "M=D"])
+        code.extend(["@R14", "A=M", "0;JMP"])
+
+        # ($RETURN): sama persis kayak return inline
+        code.append("($RETURN)")
+        code.extend(self.write_return_inline())
+        return code
+
+    # --- SHARED COMPARISON ---
+
+    def write_compare_shared(self, command, index):
+        # R15 = return-address, terus lompat ke $EQ/$GT/$LT
+        self.compare_count += 1
+        ret_label = f"{self.current_filename}$RET_CMP.{index}"
+        return [f"@{ret_label}", "D=A", "@R15", "M=D",
+                f"@${command.upper()}", "0;JMP", f"({ret_label})"]
+
+    def shared_compare_routines(self):
+        # Tiap routine: pop y, x -> x-y, tulis true (-1) dulu ke slot x,
+        # kalo kondisi gagal timpa jadi false (0), terus balik lewat R15
+        code = ["// Shared comparison routines"]
+        for command in ['eq', 'gt', 'lt']:
+            jmp = {'eq':'JEQ', 'gt':'JGT', 'lt':'JLT'}[command]
+            code.append(f"(${command.upper()})")
+            code.extend(self.pop_stack_to_D_and_M())
+            code.extend(["D=M-D", "M=-1", "@$CMP_END", f"D;{jmp}",
+                         "@SP", "A=M-1", "M=0"])
+            if command != 'lt':
+                code.extend(["@$CMP_END", "0;JMP"])
+        code.extend(["($CMP_END)", "@R15", "A=M", "0;JMP"])
+        return code
+
+def translate_job(input_path, options, filename, commands):
+    # Dijalanin di worker process: translate satu file, balikin teks + statistik
+    translator = VMTranslator(input_path, **options)
+    fragment = translator.translate_source(filename, commands)
+    return fragment, translator.stats()
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python VMTranslator.py <input_file.vm OR input_directory>")
-    else:
-        translator = VMTranslator(sys.argv[1])
-        translator.translate()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="VM to Hack assembly translator")
+    parser.add_argument("input", help="input_file.vm OR input_directory OR '-' for stdin")
+    parser.add_argument("-o", "--output", help="output .asm ('-' for stdout, default for stdin input)")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="emit the bootstrap code for stdin input (files use Sys.vm detection)")
+    parser.add_argument("--shared-calls", action="store_true",
+                        help="emit one shared $CALL/$RETURN routine instead of inlining every call/return")
+    parser.add_argument("--shared-compare", action="store_true",
+                        help="emit shared $EQ/$GT/$LT routines instead of inlining every comparison")
+    parser.add_argument("--cache-tos", action="store_true",
+                        help="keep the top of the stack in D across straight-line commands")
+    parser.add_argument("--fuse", action="store_true",
+                        help="fuse common VM command windows and fold constant expressions")
+    parser.add_argument("--prune", action="store_true",
+                        help="drop functions that are not reachable from Sys.init (directory mode)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="translate the .vm files of a directory in N worker processes")
+    parser.add_argument("--report", help="write a JSON ROM cost report per VM command, function and file")
+    parser.add_argument("--cache-dir", help="reuse translated files from this cache directory")
+    parser.add_argument("--cache-size", type=float, default=64,
+                        help="cache size limit in MB, least recently used entries are evicted (default: 64)")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache_dir:
+        cache = TranslationCache(args.cache_dir, int(args.cache_size * 1024 * 1024))
+
+    translator = VMTranslator(args.input, shared_calls=args.shared_calls,
+                              shared_compare=args.shared_compare, cache_tos=args.cache_tos,
+                              fuse_commands=args.fuse, prune_functions=args.prune, jobs=args.jobs,
+                              cache=cache, output_file=args.output, bootstrap=args.bootstrap,
+                              report_file=args.report)
+    try:
+        translator.translate()
+    except BrokenPipeError:
+        # Pembaca pipe berhenti duluan (misal `| head`), gak usah traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
\ No newline at end of file
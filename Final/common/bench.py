@@ -0,0 +1,67 @@
+import sys
+import json
+import time
+import platform
+import resource
+import tracemalloc
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+# Helper bareng buat benchmark assembler (Final/6) dan compiler Jack
+# (Final/11): ukur memory, jalanin tiap case di process baru, simpen dan
+# bandingin hasil JSON. Yang spesifik (generator program, fase yang
+# diukur) tetap di benchmark.py masing-masing.
+
+def peak_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS ngasih byte, Linux ngasih KB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def traced(fn, *args):
+    """Runs fn under tracemalloc; returns (result, peak KB allocated during the call)."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    return result, (tracemalloc.get_traced_memory()[1] - before) // 1024
+
+def run_isolated(fn, *args):
+    # Process baru per case, biar peak RSS-nya gak kecampur
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(fn, *args).result()
+
+def git_revision(cwd):
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_report(filename, cwd, results, **fields):
+    """Saves results as JSON together with the revision and platform info."""
+    report = {
+        "revision": git_revision(cwd),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **fields,
+        "results": results,
+    }
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to: {filename}")
+
+def compare(results, old_file, phases, rate, width=28):
+    """Prints the throughput ratio (field `rate` of every phase) against a previous JSON result."""
+    with open(old_file, 'r') as f:
+        old = {r["name"]: r for r in json.load(f)["results"]}
+
+    print(f"\nCompared to {old_file}:")
+    for result in results:
+        prev = old.get(result["name"])
+        if prev is None: continue
+        line = f"{result['name']:<{width}}"
+        for phase in phases:
+            if phase not in prev or phase not in result: continue
+            ratio = result[phase][rate] / prev[phase][rate]
+            line += f" | {phase} x{ratio:5.2f}"
+        print(line)
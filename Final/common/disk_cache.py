@@ -0,0 +1,65 @@
+import os
+
+# Cache LRU di disk buat VM translator (Final/8) dan token cache Jack
+# (Final/11). Satu entry = satu file <key><suffix>; subclass cuma nentuin
+# key dan serialisasi (encode/decode) isinya.
+
+class DiskCache:
+    """
+    Least recently used cache of blobs in a directory, keyed by a hex digest.
+    Subclasses set `suffix` and override encode()/decode(); evict() keeps the
+    directory under max_bytes.
+    """
+    suffix = ".bin"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def encode(self, value):
+        return value
+
+    def decode(self, data):
+        return data
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        """Returns the decoded entry, or None (miss) if it is missing or corrupt."""
+        try:
+            with open(self.path(key), 'rb') as f:
+                value = self.decode(f.read())
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        # mtime = waktu terakhir dipake, jadi entry yang kena hit di-touch
+        os.utime(self.path(key))
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        # Lewat file .tmp + os.replace: process lain gak pernah liat entry
+        # yang baru setengah ketulis
+        tmp = self.path(key) + f".{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(self.encode(value))
+        os.replace(tmp, self.path(key))
+
+    def evict(self):
+        """Removes the oldest entries until the directory fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix): continue
+            st = os.stat(os.path.join(self.directory, name))
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes: break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+            self.evicted += 1
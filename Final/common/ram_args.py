@@ -0,0 +1,23 @@
+# Parser argumen CLI --set/--ram, dipake bareng sama Hack emulator
+# (Final/6) dan VM interpreter (Final/8)
+
+def parse_assignments(text):
+    # "0=3,1=5" -> [(0, 3), (1, 5)]
+    pairs = []
+    for item in text.split(','):
+        if not item: continue
+        address, value = item.split('=')
+        pairs.append((int(address), int(value)))
+    return pairs
+
+def parse_addresses(text):
+    # "0,1,256-260" -> [0, 1, 256, 257, 258, 259, 260]
+    addresses = []
+    for item in text.split(','):
+        if not item: continue
+        if '-' in item:
+            lo, hi = item.split('-')
+            addresses.extend(range(int(lo), int(hi) + 1))
+        else:
+            addresses.append(int(item))
+    return addresses